@@ -8,16 +8,50 @@ import os
 import json
 import csv
 import xml.etree.ElementTree as ET
+import xml.parsers.expat
 import re
+import fnmatch
 import time
+import math
+import heapq
+import threading
+import multiprocessing
+import hashlib
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from datetime import datetime
 from io import StringIO
+from itertools import chain, compress, groupby, islice, zip_longest
 from pathlib import Path
 from enum import Enum
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, List, Optional
 from urllib.parse import quote, urlparse, parse_qs
 
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+try:
+    from markdown_it import MarkdownIt  # Optional: Python-side Markdown rendering
+    from markdown_it.common.utils import escapeHtml, unescapeAll
+    from markdown_it.token import Token
+except ImportError:
+    MarkdownIt = None
+
+try:
+    import linkify_it  # noqa: F401  Optional: GFM bare URL autolinks for markdown-it
+    HAS_LINKIFY = True
+except ImportError:
+    HAS_LINKIFY = False
+
 
 def get_resource_path(relative_path: str) -> Path:
     """Get absolute path to resource, works for dev and PyInstaller"""
@@ -80,6 +114,446 @@ def detect_file_type(file_path: str) -> FileType:
     return FILE_TYPE_MAP.get(ext, FileType.UNKNOWN)
 
 
+# --- Disk Caches ---
+
+@contextmanager
+def atomic_write(path: Path, binary: bool = False):
+    """Open a temporary file that replaces path only once the block completes"""
+    temp_file = path.with_suffix(f'.{threading.get_ident()}.tmp')  # One per writing thread
+    try:
+        if binary:
+            f = open(temp_file, 'wb')
+        else:
+            f = open(temp_file, 'w', encoding='utf-8', newline='')
+        with f:
+            yield f
+        os.replace(temp_file, path)
+    except BaseException:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+        raise
+
+
+def prune_cache_dir(directory: Path, suffix: str, max_files: int, max_bytes: int):
+    """Drop the least recently used files ending in suffix beyond the limits
+
+    Readers touch the files they use, so modification time orders by use.
+    """
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(suffix):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue  # Removed by another thread
+            entries.append((st.st_mtime, st.st_size, entry.path))
+    entries.sort(reverse=True)
+    total = 0
+    for i, (_, size, path) in enumerate(entries):
+        total += size
+        if i >= max_files or total > max_bytes:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# --- Markdown Rendering ---
+
+MD_FENCE = re.compile(r' {0,3}(`{3,}|~{3,})')
+MD_LIST_ITEM = re.compile(r' {0,3}(?:[-+*]|\d{1,9}[.)])(?:[ \t]|$)')
+MD_LINK_DEFINITION = re.compile(r' {0,3}\[[^\]]+\]:')
+MD_RAW_HTML_BLOCK = re.compile(r' {0,3}<(?:(script|pre|style|textarea)(?:[\s>]|$)|(!--))', re.IGNORECASE)
+MD_HTML_LINE = re.compile(r' {0,3}</?[A-Za-z]')
+MD_VIRTUAL_THRESHOLD = 2 * 1024 * 1024  # Larger documents only render blocks near the viewport
+SOURCE_MAP_CACHE_SIZE = 16  # Scanned file versions kept in memory
+
+
+def split_markdown_blocks(lines: List[str]) -> Optional[List[str]]:
+    """Split Markdown source lines into top-level chunks that parse independently.
+
+    Chunks break only at blank lines outside fenced code and raw HTML blocks,
+    where the next line starts at the margin and does not continue a list or
+    blockquote. Rendering the chunks one by one gives the same HTML as
+    rendering the whole source. Returns None when the source has link
+    reference definitions, which can affect any chunk, or a fence inside a
+    possible HTML block, where only a full parse can tell what it is.
+    """
+    chunks = []
+    current = []
+    fence = None  # Opening fence of the code block we are in
+    html_end = None  # Closing marker of the raw HTML block we are in
+    after_blank = False
+    in_html = False  # Inside lines that may form an HTML block (ends at a blank line)
+    in_list = False
+    in_quote = False
+
+    for line in lines:
+        if fence:
+            current.append(line)
+            match = MD_FENCE.match(line)
+            if (match and match.group(1).startswith(fence)
+                    and not line[match.end():].strip()):
+                fence = None
+            continue
+        if html_end:
+            current.append(line)
+            if html_end in line.lower():
+                html_end = None
+            continue
+        if not line.strip():
+            after_blank = True
+            in_html = False
+            current.append(line)
+            continue
+
+        at_margin = not line[0].isspace()
+        is_list_item = bool(MD_LIST_ITEM.match(line))
+        is_quote = line.lstrip().startswith('>')
+        if (after_blank and at_margin and current
+                and not (in_list and is_list_item) and not (in_quote and is_quote)):
+            chunks.append('\n'.join(current))
+            current = []
+            in_list = in_quote = False
+        after_blank = False
+        current.append(line)
+
+        if MD_LINK_DEFINITION.match(line):
+            return None
+        in_list = in_list or is_list_item
+        in_quote = in_quote or is_quote
+        match = MD_FENCE.match(line)
+        if match:
+            if in_html:
+                return None
+            fence = match.group(1)
+            continue
+        in_html = in_html or bool(MD_HTML_LINE.match(line))
+        match = MD_RAW_HTML_BLOCK.match(line)
+        if match:
+            end = f'</{match.group(1).lower()}>' if match.group(1) else '-->'
+            if end not in line.lower()[match.end():]:
+                html_end = end
+
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+
+@dataclass
+class MarkdownSourceMap:
+    """Gutter entries of a Markdown source, as compact parallel arrays.
+
+    Each entry pairs a source line with the kind of element the page renders
+    for it. Type codes: '1'-'6' heading level, 'p' paragraph, 'l' list item,
+    'q' blockquote line, 't' table row, 'r' horizontal rule, 'f' code fence,
+    'c' code line.
+    """
+    lines: array        # 1-based source line of each entry ('I')
+    types: str          # One type code per entry
+    has_diagrams: bool  # Contains a mermaid fence
+
+
+def scan_markdown_blocks(lines: List[str]) -> MarkdownSourceMap:
+    """Find the source line of every block element the page renders.
+
+    Consecutive text lines form one paragraph, so they get one 'p' entry.
+    """
+    entry_lines = []
+    types = []
+    fence = None  # Opening fence of the code block we are in
+    in_table = False
+    in_paragraph = False
+    has_diagrams = False
+
+    for i, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if not stripped:
+            if fence:
+                entry_lines.append(i)
+                types.append('c')
+            else:
+                in_paragraph = in_table = False
+            continue
+
+        # Backtick and tilde fences; a block closes at a fence like its opening one
+        match = MD_FENCE.match(stripped) if stripped[0] in '`~' else None
+        if match and (not fence or (match.group(1).startswith(fence)
+                                    and not stripped[match.end():].strip())):
+            if fence:
+                fence = None
+            else:
+                fence = match.group(1)
+                if stripped[match.end():].split()[:1] == ['mermaid']:
+                    has_diagrams = True
+            in_paragraph = False
+            entry_lines.append(i)
+            types.append('f')
+            continue
+        if fence:
+            entry_lines.append(i)
+            types.append('c')
+            continue
+
+        first = stripped[0]
+        code = None
+        # Horizontal rule: 3+ of the same char (before list items, for '* * *')
+        if first in '-*_' and not in_table:
+            no_space = stripped.replace(' ', '')
+            if len(no_space) >= 3 and no_space == first * len(no_space):
+                code = 'r'
+        if code:
+            pass
+        elif first == '#':
+            level = len(stripped) - len(stripped.lstrip('#'))
+            if level > 6:
+                continue
+            code = str(level)
+        elif first in '-*+' and (len(stripped) == 1 or stripped[1] == ' '):
+            code = 'l'
+        elif first.isdigit() and '. ' in stripped[:4]:
+            code = 'l'
+        elif first == '>':
+            code = 'q'
+        elif first == '|' and stripped.endswith('|'):
+            in_paragraph = False
+            in_table = True
+            # Separator rows render no element
+            if stripped.replace(' ', '').replace('-', '').replace('|', '').replace(':', ''):
+                entry_lines.append(i)
+                types.append('t')
+            continue
+        else:
+            if not in_paragraph:
+                entry_lines.append(i)
+                types.append('p')
+                in_paragraph = True
+            in_table = False
+            continue
+
+        entry_lines.append(i)
+        types.append(code)
+        in_paragraph = in_table = False
+
+    return MarkdownSourceMap(array('I', entry_lines), ''.join(types), has_diagrams)
+
+
+class MarkdownRenderer:
+    """Render Markdown to HTML in Python and cache it on disk for later loads.
+
+    Output matches the viewer page's marked.js setup (GFM, line breaks,
+    mermaid fences as <div class="mermaid">, code as language-* blocks).
+    Needs markdown-it-py; without it the page keeps parsing with marked.js.
+    Cached HTML lives under ~/.markdown-viewer/cache/, keyed by file path,
+    mtime, size and RENDERER_VERSION, and is checked against a digest of
+    the content before use.
+    """
+
+    RENDERER_VERSION = 1                    # Bump when the HTML output changes
+    CACHE_MAX_FILES = 512
+    CACHE_MAX_BYTES = 64 * 1024 * 1024
+    TASK_ITEM = re.compile(r'\[([ xX])\][ \t]+')
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = cache_dir or Path.home() / ".markdown-viewer" / "cache"
+        self._render_lock = threading.Lock()  # One background render at a time
+        self._pending_lock = threading.Lock()
+        self._pending = set()  # Cache files being rendered
+        self.md = None
+        if MarkdownIt is not None:
+            md = MarkdownIt('commonmark', {'html': True, 'xhtmlOut': False, 'breaks': True,
+                                            'linkify': HAS_LINKIFY})
+            md.enable(['table', 'strikethrough'] + (['linkify'] if HAS_LINKIFY else []))
+            md.add_render_rule('fence', self._render_code)
+            md.add_render_rule('code_block', self._render_code)
+            md.add_render_rule('softbreak', self._render_break)
+            md.add_render_rule('hardbreak', self._render_break)
+            md.add_render_rule('s_open', lambda renderer, tokens, idx, options, env: '<del>')
+            md.add_render_rule('s_close', lambda renderer, tokens, idx, options, env: '</del>')
+            md.add_render_rule('th_open', self._render_cell)
+            md.add_render_rule('td_open', self._render_cell)
+            md.core.ruler.push('task_lists', self._task_lists)
+            self.md = md
+
+    @property
+    def available(self) -> bool:
+        return self.md is not None
+
+    def render(self, text: str) -> str:
+        """Render Markdown text to HTML (uncached)"""
+        return self.md.render(text)
+
+    def cached_html(self, file_path: Optional[str], text: str) -> Optional[str]:
+        """HTML previously rendered for this file and content, or None"""
+        entry = self._cache_entry(file_path, text)
+        if entry is None:
+            return None
+        cache_file, digest = entry
+        try:
+            with open(cache_file, 'r', encoding='utf-8', newline='') as f:
+                # First line is the content digest, guarding against a file
+                # rewritten within the same mtime
+                if f.readline().rstrip('\n') != digest:
+                    return None
+                html = f.read()
+            os.utime(cache_file)  # Most recently used
+            return html
+        except OSError:
+            return None
+
+    def cache_in_background(self, file_path: Optional[str], text: str):
+        """Render a file on a worker thread and cache the HTML for its next load.
+
+        Parsing a large document in Python is slower than marked.js in the page,
+        so a cache miss is shown with marked.js while this fills the cache.
+        """
+        entry = self._cache_entry(file_path, text)
+        if entry is None:
+            return
+        with self._pending_lock:
+            if entry[0] in self._pending:
+                return
+            self._pending.add(entry[0])
+        threading.Thread(target=self._render_to_cache, args=(entry, text), daemon=True).start()
+
+    def _cache_entry(self, file_path: Optional[str], text: str):
+        """(cache file, content digest) for a file, or None if it cannot be cached"""
+        if not self.available or not file_path:
+            return None
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        key = hashlib.sha1(
+            f"{self.RENDERER_VERSION}\0{os.path.normcase(os.path.abspath(file_path))}"
+            f"\0{st.st_mtime_ns}\0{st.st_size}".encode('utf-8')
+        ).hexdigest()
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+        return self.cache_dir / f"{key}.html", digest
+
+    def _render_to_cache(self, entry, text: str):
+        cache_file, digest = entry
+        try:
+            with self._render_lock:
+                html = self.render(text)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with atomic_write(cache_file) as f:
+                f.write(digest + '\n')
+                f.write(html)
+            prune_cache_dir(self.cache_dir, '.html', self.CACHE_MAX_FILES, self.CACHE_MAX_BYTES)
+        except Exception as e:
+            print(f"Error caching rendered Markdown: {e}")
+        finally:
+            with self._pending_lock:
+                self._pending.discard(cache_file)
+
+    @staticmethod
+    def _render_code(renderer, tokens, idx, options, env) -> str:
+        """Code blocks as the page's custom marked renderer writes them (bound to the markdown-it renderer)"""
+        token = tokens[idx]
+        lang = unescapeAll(token.info).strip() if token.type == 'fence' else ''
+        code = token.content[:-1] if token.content.endswith('\n') else token.content
+        if lang == 'mermaid':
+            return '<div class="mermaid">' + code + '</div>'
+        return f'<pre><code class="language-{lang}">{escapeHtml(code)}</code></pre>\n'
+
+    @staticmethod
+    def _render_cell(renderer, tokens, idx, options, env) -> str:
+        """Table cells with marked's align attribute instead of an inline style"""
+        token = tokens[idx]
+        style = token.attrGet('style')
+        if style:
+            return f'<{token.tag} align="{style.split(":", 1)[1]}">'
+        return f'<{token.tag}>'
+
+    @staticmethod
+    def _render_break(renderer, tokens, idx, options, env) -> str:
+        """Line breaks as a bare <br>, like marked with breaks enabled"""
+        return '<br>'
+
+    def _task_lists(self, state):
+        """Turn a leading [ ] / [x] in list items into checkboxes, as marked's GFM mode does"""
+        tokens = state.tokens
+        for i, token in enumerate(tokens):
+            if token.type != 'inline' or not token.children or i < 2:
+                continue
+            opener = tokens[i - 2] if tokens[i - 1].type == 'paragraph_open' else tokens[i - 1]
+            first = token.children[0]
+            match = self.TASK_ITEM.match(first.content) if first.type == 'text' else None
+            if opener.type != 'list_item_open' or not match:
+                continue
+            checked = 'checked="" ' if match.group(1) != ' ' else ''
+            checkbox = Token('html_inline', '', 0)
+            checkbox.content = f'<input {checked}disabled="" type="checkbox"> '
+            first.content = first.content[match.end():]
+            token.children.insert(0, checkbox)
+
+
+class HighlightCache:
+    """Syntax-highlighted HTML of code files, cached on disk for later loads.
+
+    The code page highlights with highlight.js in chunks and hands the
+    chunks back once all are done. Stored under ~/.markdown-viewer/highlight/,
+    keyed by file path, mtime, size, language and highlighter version, and
+    checked against a digest of the content before use.
+    """
+
+    HIGHLIGHT_VERSION = 1                   # Bump when the page's chunks or highlight options change
+    CACHE_MAX_FILES = 256
+    CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = cache_dir or Path.home() / ".markdown-viewer" / "highlight"
+        self.highlighter_version = ''  # highlight.js release, set once the script is loaded
+
+    def entry(self, file_path: Optional[str], text: str, language: str):
+        """(cache file, content digest) for a file, or None if it cannot be cached"""
+        if not file_path:
+            return None
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        key = hashlib.sha1(
+            f"{self.HIGHLIGHT_VERSION}\0{self.highlighter_version}\0{language}"
+            f"\0{os.path.normcase(os.path.abspath(file_path))}\0{st.st_mtime_ns}\0{st.st_size}".encode('utf-8')
+        ).hexdigest()
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+        return self.cache_dir / f"{key}.json", digest
+
+    def load(self, entry) -> Optional[List[str]]:
+        """Highlighted chunks stored for a cache entry, or None"""
+        cache_file, digest = entry
+        try:
+            with open(cache_file, 'r', encoding='utf-8', newline='') as f:
+                # First line is the content digest, guarding against a file
+                # rewritten within the same mtime
+                if f.readline().rstrip('\n') != digest:
+                    return None
+                chunks = json.load(f)
+            os.utime(cache_file)  # Most recently used
+            return chunks
+        except (OSError, ValueError):
+            return None
+
+    def save_in_background(self, entry, chunks: List[str]):
+        """Write highlighted chunks on a worker thread"""
+        threading.Thread(target=self._save, args=(entry, chunks), daemon=True).start()
+
+    def _save(self, entry, chunks: List[str]):
+        cache_file, digest = entry
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with atomic_write(cache_file) as f:
+                f.write(digest + '\n')
+                json.dump(chunks, f)
+            prune_cache_dir(self.cache_dir, '.json', self.CACHE_MAX_FILES, self.CACHE_MAX_BYTES)
+        except OSError as e:
+            print(f"Error caching highlighted code: {e}")
+
+
 # --- Search and Bookmark System ---
 
 @dataclass
@@ -94,62 +568,954 @@ class SearchResult:
     match_count: int
 
 
+# --- Search Index ---
+
+SEARCH_INDEX_VERSION = 2
+INDEX_MAX_FILE_SIZE = 16 * 1024 * 1024      # Larger files are never indexed (always scanned)
+INDEX_SEGMENT_MAX_POSTINGS = 8_000_000      # Flush threshold while building (~32 MB of ids)
+INDEX_MAX_SEGMENTS = 8                      # Merge small delta segments beyond this count
+SEARCH_MMAP_THRESHOLD = 32 * 1024 * 1024    # Larger files are searched through mmap
+SEARCH_MMAP_CHUNK = 8 * 1024 * 1024         # Bytes decoded or counted at a time in mmap scans
+SEARCH_MAX_LINE_BYTES = 64 * 1024           # Longest line decoded for results from mmap scans
+PARALLEL_SCAN_MIN_FILES = 64                # Smaller unindexed folders are scanned in-process
+PARALLEL_SCAN_MIN_SHARD = 16                # Files per worker task
+PARALLEL_SCAN_TICK = 0.05                   # Seconds between empty batches while waiting on shards
+SEARCH_CACHE_SIZE = 32                      # Completed folder searches kept in memory
+SEARCH_CACHE_TTL = 300                      # Seconds before a cached search is re-run from disk
+
+
+def _trigram_key(trigram: str) -> int:
+    """Pack a 3-character string into a sortable 63-bit integer"""
+    return (ord(trigram[0]) << 42) | (ord(trigram[1]) << 21) | ord(trigram[2])
+
+
+def _text_trigrams(text: str) -> set:
+    """Return packed trigram keys of case-folded text"""
+    folded = text.casefold()
+    trigrams = {folded[i:i + 3] for i in range(len(folded) - 2)}
+    return {_trigram_key(t) for t in trigrams}
+
+
+def _regex_literals(pattern: str) -> List[str]:
+    """Extract top-level literal runs that every match of pattern must contain"""
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, OverflowError, RecursionError):
+        return []
+
+    runs = []
+    current = []
+    for op, arg in parsed:
+        if op == sre_parse.LITERAL:
+            current.append(chr(arg))
+        else:
+            if current:
+                runs.append(''.join(current))
+            current = []
+    if current:
+        runs.append(''.join(current))
+    return runs
+
+
+def _regex_is_line_local(pattern: str, flags: int = 0) -> bool:
+    """Check that matching pattern over a whole buffer finds the same matches
+    as matching it line by line (given no match runs past its line).
+
+    Rejects patterns that can match empty, anchors other than '^', and
+    lookarounds or conditionals, which can see across line edges.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, OverflowError, RecursionError):
+        return False
+    if parsed.getwidth()[0] == 0:
+        return False
+
+    def nested(arg):
+        if isinstance(arg, sre_parse.SubPattern):
+            yield arg
+        elif isinstance(arg, (list, tuple)):
+            for item in arg:
+                yield from nested(item)
+
+    pending = [parsed]
+    while pending:
+        for op, arg in pending.pop():
+            if op == sre_parse.AT:
+                if arg != sre_parse.AT_BEGINNING:
+                    return False
+            elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT, sre_parse.GROUPREF_EXISTS):
+                return False
+            else:
+                pending.extend(nested(arg))
+    return True
+
+
+class IndexSegment:
+    """Immutable on-disk posting lists for one batch of indexed files.
+
+    Layout: header, sorted trigram keys (uint64), posting offsets (uint64,
+    one extra sentinel), then file ids (uint32). Lookups bisect the keys
+    through mmap, so only the pages for the queried trigrams are read.
+    """
+
+    MAGIC = b'MVIX'
+    HEADER = struct.Struct('<4sIQQ')  # magic, version, key count, posting count
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @classmethod
+    def write(cls, path: Path, postings: dict) -> 'IndexSegment':
+        """Write trigram -> array('I') postings to a new segment file"""
+        keys = array('Q', sorted(postings))
+        offsets = array('Q', [0])
+        total = 0
+        for key in keys:
+            total += len(postings[key])
+            offsets.append(total)
+
+        with open(path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, SEARCH_INDEX_VERSION, len(keys), total))
+            keys.tofile(f)
+            offsets.tofile(f)
+            for key in keys:
+                postings[key].tofile(f)
+        return cls(path)
+
+    def posting_count(self) -> int:
+        """Total number of postings stored in this segment (0 if unreadable)"""
+        try:
+            with open(self.path, 'rb') as f:
+                magic, version, _, posting_count = self.HEADER.unpack(f.read(self.HEADER.size))
+        except (OSError, struct.error):
+            return 0
+        return posting_count if magic == self.MAGIC and version == SEARCH_INDEX_VERSION else 0
+
+    def read_all(self) -> dict:
+        """Load every posting list (used when merging small segments)"""
+        postings = {}
+        try:
+            with open(self.path, 'rb') as f:
+                magic, version, key_count, posting_count = self.HEADER.unpack(f.read(self.HEADER.size))
+                if magic != self.MAGIC or version != SEARCH_INDEX_VERSION:
+                    return postings
+                keys = array('Q')
+                keys.fromfile(f, key_count)
+                offsets = array('Q')
+                offsets.fromfile(f, key_count + 1)
+                ids = array('I')
+                ids.fromfile(f, posting_count)
+        except (OSError, EOFError, struct.error):
+            return postings
+        for pos, key in enumerate(keys):
+            postings[key] = ids[offsets[pos]:offsets[pos + 1]]
+        return postings
+
+    def lookup(self, trigram_keys: List[int]) -> List[array]:
+        """Return posting lists for the given trigram keys (empty if missing)"""
+        results = []
+        with open(self.path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, key_count, posting_count = self.HEADER.unpack_from(mm, 0)
+                if magic != self.MAGIC or version != SEARCH_INDEX_VERSION:
+                    return [array('I') for _ in trigram_keys]
+
+                view = memoryview(mm)
+                keys_start = self.HEADER.size
+                offsets_start = keys_start + key_count * 8
+                ids_start = offsets_start + (key_count + 1) * 8
+                keys = view[keys_start:offsets_start].cast('Q')
+                offsets = view[offsets_start:ids_start].cast('Q')
+                try:
+                    for key in trigram_keys:
+                        pos = bisect_left(keys, key)
+                        if pos < key_count and keys[pos] == key:
+                            begin = ids_start + offsets[pos] * 4
+                            end = ids_start + offsets[pos + 1] * 4
+                            results.append(array('I', view[begin:end].cast('I')))
+                        else:
+                            results.append(array('I'))
+                finally:
+                    keys.release()
+                    offsets.release()
+                    view.release()
+        return results
+
+
+class SearchIndex:
+    """Persistent trigram inverted index for one folder root.
+
+    Stored under ~/.markdown-viewer/index/ keyed by a hash of the folder path.
+    The manifest is a snapshot table of (file_id, mtime_ns, size, indexed,
+    content hash) per file. Each refresh diffs it against the folder and only
+    re-tokenizes added or changed files into a new delta segment; replaced
+    ids simply disappear from the manifest and are filtered out at query time.
+    """
+
+    def __init__(self, folder_path: str):
+        self.folder_path = os.path.normcase(os.path.abspath(folder_path))
+        self.index_dir = Path.home() / ".markdown-viewer" / "index"
+        self.key = hashlib.sha1(self.folder_path.encode('utf-8')).hexdigest()[:16]
+        self.manifest_file = self.index_dir / f"{self.key}.json"
+        self.files = {}  # path -> [file_id, mtime_ns, size, indexed, content_hash]
+        self.segments = []
+        self.next_id = 0
+        self.dead_ids = 0  # ids replaced or deleted but still present in segments
+        self.generation = 0
+        self._paths_by_id = None
+        self._load()
+
+    def refresh(self, file_paths: List[str]) -> bool:
+        """Diff the snapshot table against the folder and index what changed.
+
+        Returns True if anything was added, changed or deleted.
+        """
+        current = {}
+        for path in file_paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            current[path] = (st.st_mtime_ns, st.st_size)
+        changed = self.refresh_stats(current)
+        if self.needs_rebuild():
+            self.rebuild()
+        return changed
+
+    def refresh_stats(self, file_stats: dict, scanned: Optional[dict] = None,
+                      in_scope=None, is_cancelled=None) -> bool:
+        """Refresh from already collected {path: (mtime_ns, size)} stats.
+
+        scanned optionally maps paths to (content_hash, trigrams) already read
+        by the caller, so those files are not read again. When file_stats only
+        covers part of the folder (a name filter), in_scope(path) tells which
+        known files it covers; the others are kept as they are. Once
+        is_cancelled() returns True no more files are read; those left keep
+        their old snapshot and are picked up by the next refresh.
+        """
+        removed = [path for path in self.files
+                   if path not in file_stats and (in_scope is None or in_scope(path))]
+        for path in removed:
+            del self.files[path]
+        self.dead_ids += len(removed)
+
+        changed = [path for path, stats in file_stats.items() if not self.is_current(path, stats)]
+
+        if not removed and not changed:
+            return False
+
+        postings = {}
+        posting_count = 0
+        cancelled = False
+        for path in changed:
+            if is_cancelled and is_cancelled():
+                cancelled = True
+                break
+            mtime_ns, size = file_stats[path]
+            entry = self.files.get(path)
+            if scanned and path in scanned:
+                digest, trigrams = scanned[path]
+            else:
+                digest, trigrams = self._read_file(path, size)
+
+            # Touched but identical content (e.g. git checkout): only update the snapshot
+            if entry is not None and digest is not None and digest == entry[4]:
+                entry[1], entry[2] = mtime_ns, size
+                continue
+
+            if entry is not None:
+                self.dead_ids += 1
+            file_id = self.next_id
+            self.next_id += 1
+            self.files[path] = [file_id, mtime_ns, size, trigrams is not None, digest]
+            if not trigrams:
+                continue
+            for key in trigrams:
+                ids = postings.get(key)
+                if ids is None:
+                    postings[key] = array('I', (file_id,))
+                else:
+                    ids.append(file_id)
+            posting_count += len(trigrams)
+            if posting_count >= INDEX_SEGMENT_MAX_POSTINGS:
+                self._flush_segment(postings)
+                postings = {}
+                posting_count = 0
+        if postings:
+            self._flush_segment(postings)
+
+        self._paths_by_id = None
+        if not cancelled:
+            self._compact()
+        self._save()
+        return True
+
+    def is_current(self, path: str, stats: tuple) -> bool:
+        """Whether path is indexed as of its (mtime_ns, size) stats"""
+        entry = self.files.get(path)
+        return entry is not None and entry[1] == stats[0] and entry[2] == stats[1]
+
+    def needs_rebuild(self) -> bool:
+        """Whether dead ids dominate: re-tokenizing is then cheaper than filtering every list"""
+        return self.dead_ids > max(len(self.files), 1000)
+
+    def rebuild(self, scanned: Optional[dict] = None) -> None:
+        """Drop all segments and re-tokenize every known file
+
+        scanned optionally maps paths to (content_hash, trigrams) read
+        beforehand, e.g. outside a lock; other files are read here.
+        """
+        file_stats = {path: (entry[1], entry[2]) for path, entry in self.files.items()}
+        self._drop_segments(self.segments)
+        self.files = {}
+        self.segments = []
+        self.next_id = 0
+        self.dead_ids = 0
+        self.generation += 1
+        self.refresh_stats(file_stats, scanned)
+
+    def candidate_paths(self, query: str, use_regex: bool, operator: str) -> Optional[set]:
+        """Return paths that can match the query, or None when the index can't narrow"""
+        if ' ' in query and operator in ['AND', 'OR']:
+            keywords = [k.casefold() for k in query.split()]
+            if operator == 'OR':
+                if any(len(k) < 3 for k in keywords):
+                    return None
+                ids = set()
+                for keyword in keywords:
+                    ids |= self._ids_containing(keyword)
+            else:
+                required = [k for k in keywords if len(k) >= 3]
+                if not required:
+                    return None
+                ids = self._ids_containing_all(required)
+        elif use_regex:
+            required = [lit.casefold() for lit in _regex_literals(query) if len(lit.casefold()) >= 3]
+            if not required:
+                return None
+            ids = self._ids_containing_all(required)
+        else:
+            folded = query.casefold()
+            if len(folded) < 3:
+                return None
+            ids = self._ids_containing(folded)
+
+        if self._paths_by_id is None:
+            self._paths_by_id = {entry[0]: path for path, entry in self.files.items()}
+        paths = {self._paths_by_id[i] for i in ids if i in self._paths_by_id}
+        paths.update(path for path, entry in self.files.items() if not entry[3])
+        return paths
+
+    def _ids_containing_all(self, terms: List[str]) -> set:
+        """Intersect candidate file ids over several required terms"""
+        ids = None
+        for term in terms:
+            term_ids = self._ids_containing(term)
+            ids = term_ids if ids is None else ids & term_ids
+            if not ids:
+                break
+        return ids or set()
+
+    def _ids_containing(self, folded_term: str) -> set:
+        """Return ids of indexed files containing every trigram of a folded term"""
+        trigram_keys = sorted({_trigram_key(folded_term[i:i + 3])
+                               for i in range(len(folded_term) - 2)})
+        ids = set()
+        for segment in self.segments:
+            try:
+                lists = segment.lookup(trigram_keys)
+            except (OSError, ValueError):
+                # Damaged or missing segment: fall back to treating everything as a candidate
+                return set(entry[0] for entry in self.files.values())
+            lists.sort(key=len)
+            segment_ids = set(lists[0])
+            for ids_list in lists[1:]:
+                if not segment_ids:
+                    break
+                segment_ids.intersection_update(ids_list)
+            ids |= segment_ids
+        return ids
+
+    @staticmethod
+    def _read_file(path: str, size: int) -> tuple:
+        """Read file once; returns (content_hash, trigrams or None if not indexed)"""
+        digest, trigrams, _ = SearchIndex._read_file_text(path, size)
+        return digest, trigrams
+
+    @staticmethod
+    def _read_file_text(path: str, size: int) -> tuple:
+        """Like _read_file, also returning the text as search reads it (None if not read)"""
+        if size > INDEX_MAX_FILE_SIZE:
+            return None, None, None
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None, None, None
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            # Search skips undecodable files too, so they can never match
+            return digest, set(), None
+        # Same newline translation as text-mode reads done by search
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return digest, _text_trigrams(text), text
+
+    def _flush_segment(self, postings: dict) -> None:
+        """Write accumulated postings as a new segment"""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.generation += 1
+        path = self.index_dir / f"{self.key}-{self.generation}.seg"
+        self.segments.append(IndexSegment.write(path, postings))
+
+    def _compact(self) -> None:
+        """Keep segment count bounded (dead postings are dropped by rebuild())"""
+        if len(self.segments) <= INDEX_MAX_SEGMENTS:
+            return
+
+        # Merge the small delta segments into one, dropping dead ids
+        small = [seg for seg in self.segments
+                 if seg.posting_count() < INDEX_SEGMENT_MAX_POSTINGS // 2]
+        if len(small) < 2:
+            return
+        live = {entry[0] for entry in self.files.values()}
+        merged = {}
+        for segment in small:
+            for key, ids in segment.read_all().items():
+                kept = array('I', (i for i in ids if i in live))
+                if not kept:
+                    continue
+                if key in merged:
+                    merged[key].extend(kept)
+                else:
+                    merged[key] = kept
+        self.segments = [seg for seg in self.segments if seg not in small]
+        if merged:
+            self._flush_segment({key: array('I', sorted(ids)) for key, ids in merged.items()})
+        self._drop_segments(small)
+
+    def _drop_segments(self, segments: list) -> None:
+        """Delete segment files"""
+        for segment in segments:
+            try:
+                segment.path.unlink()
+            except OSError:
+                pass
+
+    def _load(self) -> None:
+        """Load manifest from disk (missing or incompatible index starts empty)"""
+        if not self.manifest_file.exists():
+            return
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != SEARCH_INDEX_VERSION:
+                # Incompatible layout: discard old segments, start from scratch
+                self._drop_segments([IndexSegment(p) for p in self.index_dir.glob(f"{self.key}-*.seg")])
+                return
+            self.files = data.get('files', {})
+            self.next_id = data.get('next_id', 0)
+            self.dead_ids = data.get('dead_ids', 0)
+            self.generation = data.get('generation', 0)
+            self.segments = [IndexSegment(self.index_dir / name) for name in data.get('segments', [])]
+        except Exception as e:
+            print(f"Error loading search index: {e}")
+            self.files = {}
+            self.segments = []
+
+    def _save(self) -> None:
+        """Write manifest atomically"""
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            data = {
+                'version': SEARCH_INDEX_VERSION,
+                'folder': self.folder_path,
+                'generation': self.generation,
+                'next_id': self.next_id,
+                'dead_ids': self.dead_ids,
+                'segments': [segment.path.name for segment in self.segments],
+                'files': self.files,
+            }
+            with atomic_write(self.manifest_file) as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"Error saving search index: {e}")
+
+
 class SearchEngine:
     """Handle full-text search across files in tree view"""
 
+    # Directories never descended into when enumerating files to search
+    IGNORED_DIRS = {'.git', 'node_modules', '.venv'}
+
     def __init__(self):
         self.results = []
         self.total_matches = 0
         self.total_files = 0
+        self._indexes = {}  # normalized folder path -> SearchIndex
+        self._index_lock = threading.Lock()  # Searches may run on worker threads
+        self.mmap_threshold = SEARCH_MMAP_THRESHOLD
+        self._result_cache = OrderedDict()  # search key -> (generation, stored at, RankedResults)
+        self._generations = {}  # normalized folder path -> change counter
+        self._scan_sizes = {}  # normalized folder path -> {path: size} of a scan not indexed yet
+        self._scan_pool = None  # Worker processes of parallel scans, started on first use
+        self._scan_pool_lock = threading.Lock()
+
+    @staticmethod
+    def _folder_key(folder_path: str) -> str:
+        return os.path.normcase(os.path.abspath(folder_path))
+
+    def get_index(self, folder_path: str) -> SearchIndex:
+        """Get (or open) the persistent index for a folder root"""
+        key = self._folder_key(folder_path)
+        if key not in self._indexes:
+            self._indexes[key] = SearchIndex(folder_path)
+        return self._indexes[key]
+
+    # --- Result cache ---
+
+    def _cache_key(self, folder_path: str, query: str, case_sensitive: bool, use_regex: bool,
+                   search_filenames: bool, operator: str,
+                   name_filters: Optional[List[str]]) -> tuple:
+        filters = tuple(name_filters) if name_filters else None
+        return (self._folder_key(folder_path), query, case_sensitive, use_regex,
+                search_filenames, operator, filters)
+
+    def folder_generation(self, folder_path: str) -> int:
+        """Change counter of a folder, taken before searching it"""
+        with self._index_lock:
+            return self._generations.setdefault(self._folder_key(folder_path), 0)
+
+    def invalidate(self, path: str):
+        """Drop cached searches of every folder containing (or inside) path"""
+        if not path:
+            return
+        key = self._folder_key(path)
+        with self._index_lock:
+            for folder in self._generations:
+                if (key == folder or key.startswith(folder.rstrip(os.sep) + os.sep)
+                        or folder.startswith(key.rstrip(os.sep) + os.sep)):
+                    self._generations[folder] = self._generations.get(folder, 0) + 1
+            for cache_key in [k for k, entry in self._result_cache.items()
+                              if entry[0] != self._generations.get(k[0], 0)]:
+                del self._result_cache[cache_key]
+
+    def cached_search(self, folder_path: str, query: str,
+                      case_sensitive: bool = False, use_regex: bool = False,
+                      search_filenames: bool = False, operator: str = 'AND',
+                      name_filters: Optional[List[str]] = None) -> Optional['RankedResults']:
+        """Return the ranked results of an unchanged repeat search, or None"""
+        key = self._cache_key(folder_path, query, case_sensitive, use_regex,
+                              search_filenames, operator, name_filters)
+        with self._index_lock:
+            entry = self._result_cache.get(key)
+            if entry is None:
+                return None
+            generation, stored_at, ranking = entry
+            if (generation != self._generations.get(key[0], 0)
+                    or time.monotonic() - stored_at > SEARCH_CACHE_TTL):
+                del self._result_cache[key]
+                return None
+            self._result_cache.move_to_end(key)
+        return ranking.copy()
+
+    def refinable_search(self, folder_path: str, query: str,
+                         case_sensitive: bool = False, use_regex: bool = False,
+                         search_filenames: bool = False, operator: str = 'AND',
+                         name_filters: Optional[List[str]] = None) -> Optional[List[SearchResult]]:
+        """Find cached results that contain every result of query, or None.
+
+        Holds for plain single-term queries: a line containing the query also
+        contains every substring of it. The narrowest such search is used.
+        """
+        if use_regex or any(c.isspace() for c in query):
+            return None
+        key = self._cache_key(folder_path, query, case_sensitive, use_regex,
+                              search_filenames, operator, name_filters)
+        needle = query if case_sensitive else query.lower()
+        best_query, best_results = '', None
+        with self._index_lock:
+            now = time.monotonic()
+            for cache_key, (generation, stored_at, ranking) in self._result_cache.items():
+                base_query = cache_key[1]
+                if (cache_key[0] != key[0] or cache_key[2:] != key[2:]
+                        or len(base_query) <= len(best_query) or base_query == query
+                        or any(c.isspace() for c in base_query)):
+                    continue
+                if (generation != self._generations.get(key[0], 0)
+                        or now - stored_at > SEARCH_CACHE_TTL):
+                    continue
+                if (base_query if case_sensitive else base_query.lower()) in needle:
+                    best_query, best_results = base_query, ranking.results
+        return best_results
+
+    def iter_refine(self, base_results: List[SearchResult], query: str,
+                    case_sensitive: bool = False, search_filenames: bool = False,
+                    operator: str = 'AND', is_cancelled=None):
+        """Yield results of query file by file, narrowing the results of a broader query.
+
+        Only files in base_results are read: those whose name matched the broader
+        query (their content was never searched) and files large enough for
+        line text to have been truncated. Files without results yield an empty
+        batch, so callers can flush what they hold on time.
+        """
+        needle = query if case_sensitive else query.lower()
+        for file_path, file_results in groupby(base_results, key=lambda r: r.file_path):
+            if is_cancelled and is_cancelled():
+                return
+            file_results = list(file_results)
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                continue
+            if file_results[0].line_number == 0 or size > self.mmap_threshold:
+                refined = self._search_path(file_path, query, case_sensitive, False,
+                                            search_filenames, operator, size=size)
+            else:
+                refined = []
+                for result in file_results:
+                    line = result.line_content if case_sensitive else result.line_content.lower()
+                    count = line.count(needle)
+                    if count:
+                        refined.append(replace(result, match_count=count))
+            yield refined
+
+    def cache_results(self, folder_path: str, query: str, case_sensitive: bool,
+                      use_regex: bool, search_filenames: bool, operator: str,
+                      name_filters: Optional[List[str]], generation: int,
+                      ranking: 'RankedResults'):
+        """Remember a completed search unless the folder changed while it ran"""
+        key = self._cache_key(folder_path, query, case_sensitive, use_regex,
+                              search_filenames, operator, name_filters)
+        with self._index_lock:
+            if generation != self._generations.get(key[0], 0):
+                return
+            self._result_cache[key] = (generation, time.monotonic(), ranking.copy())
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > SEARCH_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
 
-    def search(self, folder_path: str, tree_model, query: str,
+    def search(self, folder_path: str, query: str,
                case_sensitive: bool = False, use_regex: bool = False,
-               search_filenames: bool = False, operator: str = 'AND') -> List[SearchResult]:
+               search_filenames: bool = False, operator: str = 'AND',
+               name_filters: Optional[List[str]] = None) -> List[SearchResult]:
         """Perform search across all files visible in tree view"""
-
         results = []
-        files_searched = set()
+        for batch in self.iter_search(folder_path, query, case_sensitive, use_regex,
+                                      search_filenames, operator, name_filters):
+            results.extend(batch)
+
+        self.results = results
+        self.total_matches = len(results)
+        self.total_files = len(set(r.file_path for r in results))
+        return results
 
-        # Get all files recursively from tree model
-        all_files = self._collect_files_recursively(tree_model, folder_path)
+    def iter_search(self, folder_path: str, query: str,
+                    case_sensitive: bool = False, use_regex: bool = False,
+                    search_filenames: bool = False, operator: str = 'AND',
+                    name_filters: Optional[List[str]] = None, is_cancelled=None,
+                    index_later=None):
+        """Yield search results file by file.
+
+        Safe to run off the GUI thread: files are enumerated from disk rather
+        than the tree model, and the search stops at the next file once
+        is_cancelled() returns True. A folder searched for the first time is
+        indexed before the last results are yielded, unless index_later is
+        given: it is then passed a function that builds the index, for the
+        caller to run once it has reported the results. Files without results
+        yield an empty batch, so callers can flush what they hold on time.
+        """
+        # The index spans every filter; only files this filter can see may be dropped
+        matches_filter = self._name_filter_matcher(name_filters)
+
+        def in_scope(path):
+            return matches_filter(os.path.basename(path))
+
+        # Narrow content search to files the index says can match; files added
+        # or changed since it was updated are searched regardless. A folder
+        # searched for the first time is scanned directly. Files are searched
+        # as the walk finds them, so results start streaming immediately, and
+        # the index is brought up to date once the walk is done.
+        with self._index_lock:
+            index = self.get_index(folder_path)
+            cold = not index.files
+            candidates = None if cold else index.candidate_paths(query, use_regex, operator)
+
+        file_stats = {}
+        files = self._walk_stats(folder_path, name_filters, file_stats, is_cancelled)
+        scanned = {}
+        if cold and (os.cpu_count() or 1) > 1:
+            first = list(islice(files, PARALLEL_SCAN_MIN_FILES))
+            if len(first) == PARALLEL_SCAN_MIN_FILES:
+                scanned = yield from self._parallel_scan(chain(first, files), query, case_sensitive,
+                                                         use_regex, search_filenames, operator,
+                                                         is_cancelled)
+                files = ()
+            else:
+                files = first  # Walk done: too few files to be worth worker processes
 
-        for file_path in all_files:
-            if not os.path.isfile(file_path):
+        for file_path, size in files:
+            if is_cancelled and is_cancelled():
+                return
+            # Files the index rules out can still match by name
+            is_candidate = candidates is None or file_path in candidates
+            if not is_candidate:
+                with self._index_lock:
+                    is_candidate = not index.is_current(file_path, file_stats[file_path])
+            if not is_candidate and not search_filenames:
+                yield []
                 continue
+            yield self._search_path(file_path, query, case_sensitive, use_regex,
+                                    search_filenames, operator,
+                                    filename_only=not is_candidate, size=size)
 
-            # Search in filename if requested
-            if search_filenames:
-                filename = os.path.basename(file_path)
-                if self._match_filename(filename, query, case_sensitive):
-                    results.append(SearchResult(
-                        file_path=file_path,
-                        file_name=filename,
-                        line_number=0,
-                        line_content="[Filename match]",
-                        context_before="",
-                        context_after="",
-                        match_count=1
-                    ))
-                    files_searched.add(file_path)
+        if scanned is None or (is_cancelled and is_cancelled()):
+            return
+        if index_later is None:
+            self._update_index(index, file_stats, scanned, in_scope, is_cancelled)
+            return
+        if cold:
+            with self._index_lock:
+                # Ranked against the scan until the index is built
+                self._scan_sizes[self._folder_key(folder_path)] = {
+                    path: size for path, (_, size) in file_stats.items()}
+        index_later(lambda: self._update_index(index, file_stats, scanned, in_scope, is_cancelled))
+
+    def _walk_stats(self, folder_path: str, name_filters: Optional[List[str]], file_stats: dict,
+                    is_cancelled=None):
+        """Yield (path, size) as walk_files finds them, recording {path: (mtime_ns, size)}"""
+        for path, st in self.walk_files(folder_path, name_filters):
+            if is_cancelled and is_cancelled():
+                return
+            file_stats[path] = (st.st_mtime_ns, st.st_size)
+            yield path, st.st_size
+
+    def _update_index(self, index: SearchIndex, file_stats: dict, scanned: dict, in_scope,
+                      is_cancelled=None):
+        """Bring a folder's index up to date with the files a search walked.
+
+        Added or changed files the search did not tokenize are read outside
+        the index lock, so other searches are not held up, and so is the
+        whole folder when the index needs a rebuild. A cancelled update
+        leaves the index as it was; a folder never indexed is then scanned
+        again by the next search.
+        """
+        with self._index_lock:
+            stale = [path for path, stats in file_stats.items()
+                     if path not in scanned and not index.is_current(path, stats)]
+        for path in stale:
+            if is_cancelled and is_cancelled():
+                break
+            digest, trigrams = SearchIndex._read_file(path, file_stats[path][1])
+            if trigrams is not None:
+                trigrams = array('Q', trigrams)  # Compact: may be held for the whole folder
+            scanned[path] = (digest, trigrams)
+        with self._index_lock:
+            self._scan_sizes.pop(index.folder_path, None)
+            if is_cancelled and is_cancelled():
+                return
+            index.refresh_stats(file_stats, scanned, in_scope)
+            if not index.needs_rebuild():
+                return
+            known = {path: (entry[1], entry[2]) for path, entry in index.files.items()}
+
+        # Mostly dead ids: re-tokenize the folder outside the lock as well,
+        # then swap the new segments in
+        contents = {}
+        for path, (_, size) in known.items():
+            if is_cancelled and is_cancelled():
+                return
+            if path in scanned:
+                contents[path] = scanned[path]
+                continue
+            digest, trigrams = SearchIndex._read_file(path, size)
+            if trigrams is not None:
+                trigrams = array('Q', trigrams)
+            contents[path] = (digest, trigrams)
+        with self._index_lock:
+            if index.needs_rebuild():  # Unless another search rebuilt it meanwhile
+                # Files another search updated meanwhile are read again
+                index.rebuild({path: content for path, content in contents.items()
+                               if index.is_current(path, known[path])})
+
+    def _parallel_scan(self, files, query: str, case_sensitive: bool, use_regex: bool,
+                       search_filenames: bool, operator: str, is_cancelled=None):
+        """Scan an unindexed folder across worker processes, tokenizing it in the same pass.
+
+        files yields (path, size) as the folder is walked. Shards are submitted
+        as they fill, growing with the number of files seen, and collected in
+        submission order, so results stream in the same file order as a
+        sequential scan, with empty batches while the walk goes on or a shard
+        is still running. Returns {path: (content_hash, trigrams)} for the
+        index, or None when cancelled.
+        """
+        workers = os.cpu_count() or 1
+        scanned = {}
+        futures = deque()
+        shard = []
+        seen = 0
+        executor = self._get_scan_pool(workers)
+        try:
+            for item in files:
+                shard.append(item)
+                seen += 1
+                if len(shard) >= max(PARALLEL_SCAN_MIN_SHARD, seen // (workers * 8)):
+                    futures.append(executor.submit(_scan_shard, shard, query, case_sensitive,
+                                                   use_regex, search_filenames, operator))
+                    shard = []
+                # Hand on finished shards while the walk goes on
+                while futures and futures[0].done():
+                    shard_results, shard_scanned = futures.popleft().result()
+                    scanned.update(shard_scanned)
+                    yield shard_results
+                yield []
+            if shard:
+                futures.append(executor.submit(_scan_shard, shard, query, case_sensitive,
+                                               use_regex, search_filenames, operator))
+            while futures:
+                if is_cancelled and is_cancelled():
+                    return None
+                if not wait([futures[0]], timeout=PARALLEL_SCAN_TICK).done:
+                    yield []
                     continue
+                shard_results, shard_scanned = futures.popleft().result()
+                scanned.update(shard_scanned)
+                yield shard_results
+        except BrokenProcessPool:
+            self._drop_scan_pool(executor)  # A worker died: the next scan starts new ones
+            raise
+        finally:
+            # Shards not started yet would hold up the next search in the shared pool
+            for future in futures:
+                future.cancel()
+        return scanned
+
+    def _get_scan_pool(self, workers: int) -> ProcessPoolExecutor:
+        """The worker processes shared by parallel scans, started once"""
+        with self._scan_pool_lock:
+            if self._scan_pool is None:
+                self._scan_pool = ProcessPoolExecutor(max_workers=workers)
+            return self._scan_pool
+
+    def _drop_scan_pool(self, executor: ProcessPoolExecutor):
+        with self._scan_pool_lock:
+            if self._scan_pool is executor:
+                self._scan_pool = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Stop the worker processes of parallel scans (on exit)"""
+        with self._scan_pool_lock:
+            executor, self._scan_pool = self._scan_pool, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _search_path(self, file_path: str, query: str, case_sensitive: bool, use_regex: bool,
+                     search_filenames: bool, operator: str, filename_only: bool = False,
+                     size: Optional[int] = None, text: Optional[str] = None) -> List[SearchResult]:
+        """Search one file by name and/or content (text: the content if already read)"""
+        # Search in filename if requested
+        if search_filenames:
+            filename = os.path.basename(file_path)
+            if self._match_filename(filename, query, case_sensitive):
+                return [SearchResult(
+                    file_path=file_path,
+                    file_name=filename,
+                    line_number=0,
+                    line_content="[Filename match]",
+                    context_before="",
+                    context_after="",
+                    match_count=1
+                )]
+        if filename_only:
+            return []
+        return self._search_content(file_path, query, case_sensitive, use_regex, operator, size, text)
 
-            # Search in file content
-            if ' ' in query and operator in ['AND', 'OR']:
-                keywords = query.split()
-                file_results = self._search_multi_keyword(file_path, keywords, operator, case_sensitive)
-            elif use_regex:
-                file_results = self._search_file_regex(file_path, query, case_sensitive)
-            else:
-                file_results = self._search_file(file_path, query, case_sensitive)
+    def _search_content(self, file_path: str, query: str, case_sensitive: bool,
+                        use_regex: bool, operator: str,
+                        size: Optional[int] = None, text: Optional[str] = None) -> List[SearchResult]:
+        """Search file content, scanning files over mmap_threshold without reading them whole"""
+        if size is None:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                return []
+        if size > self.mmap_threshold:
+            return self._search_large_file(file_path, query, case_sensitive, use_regex, operator)
 
-            if file_results:
-                results.extend(file_results)
-                files_searched.add(file_path)
+        if ' ' in query and operator in ['AND', 'OR']:
+            keywords = query.split()
+            return self._search_multi_keyword(file_path, keywords, operator, case_sensitive, text)
+        elif use_regex:
+            return self._search_file_regex(file_path, query, case_sensitive, text)
+        else:
+            return self._search_file(file_path, query, case_sensitive, text)
 
-        self.results = results
-        self.total_matches = len(results)
-        self.total_files = len(files_searched)
-        return results
+    def rank_results(self, folder_path: str, results: List[SearchResult], query: str,
+                     case_sensitive: bool = False, use_regex: bool = False,
+                     operator: str = 'AND') -> 'RankedResults':
+        """Order results by relevance.
+
+        Files are scored with BM25 over match counts, using the folder index
+        for corpus size and average file length. Lines then get boosts for
+        Markdown headings and for files whose name matched.
+        """
+        multi = ' ' in query and operator in ['AND', 'OR']
+        terms = query.split() if multi else [query]
+        if not case_sensitive:
+            terms = [t.lower() for t in terms]
+
+        # Term frequencies per file; a plain or regex query is a single term
+        term_freqs = {}
+        filename_hits = set()
+        for result in results:
+            if result.line_number == 0:
+                filename_hits.add(result.file_path)
+                continue
+            freqs = term_freqs.setdefault(result.file_path, [0] * len(terms))
+            if multi:
+                line = result.line_content if case_sensitive else result.line_content.lower()
+                for i, term in enumerate(terms):
+                    freqs[i] += line.count(term)
+            else:
+                freqs[0] += result.match_count
+
+        with self._index_lock:
+            index_files = self.get_index(folder_path).files
+            scan_sizes = self._scan_sizes.get(self._folder_key(folder_path))
+            if index_files or scan_sizes is None:
+                file_sizes = {path: entry[2] for path, entry in index_files.items()}
+            else:
+                file_sizes = scan_sizes  # Still being indexed
+            total_size = sum(file_sizes.values())
+            doc_count = max(len(file_sizes), len(term_freqs), 1)
+            sizes = {path: file_sizes[path] for path in term_freqs if path in file_sizes}
+        avg_size = total_size / len(file_sizes) if file_sizes and total_size else 1
+
+        doc_freqs = [sum(1 for freqs in term_freqs.values() if freqs[i]) for i in range(len(terms))]
+        idfs = [math.log((doc_count - df + 0.5) / (df + 0.5) + 1) for df in doc_freqs]
+
+        k1, b = RankedResults.BM25_K1, RankedResults.BM25_B
+        file_scores = {}
+        for path, freqs in term_freqs.items():
+            norm = k1 * (1 - b + b * sizes.get(path, avg_size) / avg_size)
+            file_scores[path] = sum(idf * tf * (k1 + 1) / (tf + norm)
+                                    for idf, tf in zip(idfs, freqs) if tf)
+
+        scores = []
+        for result in results:
+            score = file_scores.get(result.file_path, 0.0)
+            if result.file_path in filename_hits:
+                score += RankedResults.FILENAME_BOOST
+            if result.line_number > 0:
+                score += RankedResults.LINE_WEIGHT * math.log1p(result.match_count)
+                if (result.line_content.startswith('#')
+                        and detect_file_type(result.file_path) == FileType.MARKDOWN):
+                    score += RankedResults.HEADING_BOOST
+            scores.append(score)
+        return RankedResults(results, scores)
 
     def search_single_file(self, file_path: str, query: str,
                            case_sensitive: bool = False, use_regex: bool = False,
@@ -160,36 +1526,49 @@ class SearchEngine:
         if not os.path.isfile(file_path):
             return results
 
-        if ' ' in query and operator in ['AND', 'OR']:
-            keywords = query.split()
-            results = self._search_multi_keyword(file_path, keywords, operator, case_sensitive)
-        elif use_regex:
-            results = self._search_file_regex(file_path, query, case_sensitive)
-        else:
-            results = self._search_file(file_path, query, case_sensitive)
+        results = self._search_content(file_path, query, case_sensitive, use_regex, operator)
 
         self.results = results
         self.total_matches = len(results)
         self.total_files = 1 if results else 0
         return results
 
-    def _collect_files_recursively(self, tree_model, folder_path: str) -> List[str]:
-        """Recursively collect all file paths from tree model"""
-        files = []
-        root_index = tree_model.index(folder_path)
+    def walk_files(self, folder_path: str, name_filters: Optional[List[str]] = None):
+        """Yield (path, stat) for every file the tree would show under folder_path.
 
-        def traverse(parent_index):
-            for row in range(tree_model.rowCount(parent_index)):
-                index = tree_model.index(row, 0, parent_index)
-                file_path = tree_model.filePath(index)
+        name_filters are FILTER_OPTIONS glob patterns (None for all files), matched
+        case-insensitively like QFileSystemModel. Hidden entries and IGNORED_DIRS
+        are skipped, and directory symlinks are not followed.
+        """
+        matches_filter = self._name_filter_matcher(name_filters)
+        try:
+            with os.scandir(folder_path) as it:
+                entries = sorted(it, key=lambda e: e.name.lower())
+        except OSError:
+            return
 
-                if os.path.isfile(file_path):
-                    files.append(file_path)
-                elif os.path.isdir(file_path):
-                    traverse(index)  # Recurse into subdirectory
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in self.IGNORED_DIRS:
+                        yield from self.walk_files(entry.path, name_filters)
+                    continue
+                if not entry.is_file():
+                    continue
+                if not matches_filter(entry.name):
+                    continue
+                yield entry.path, entry.stat()
+            except OSError:
+                continue
 
-        traverse(root_index)
-        return files
+    def _name_filter_matcher(self, name_filters: Optional[List[str]]):
+        """Build a case-insensitive file name predicate for FILTER_OPTIONS patterns"""
+        if not name_filters:
+            return lambda name: True
+        patterns = [p.lower() for p in name_filters]
+        return lambda name: any(fnmatch.fnmatchcase(name.lower(), p) for p in patterns)
 
     def _match_filename(self, filename: str, query: str, case_sensitive: bool) -> bool:
         """Check if query matches filename"""
@@ -197,114 +1576,460 @@ class SearchEngine:
         search_query = query if case_sensitive else query.lower()
         return search_query in search_name
 
-    def _search_file(self, file_path: str, query: str, case_sensitive: bool) -> List[SearchResult]:
+    def _search_file(self, file_path: str, query: str, case_sensitive: bool,
+                     text: Optional[str] = None) -> List[SearchResult]:
         """Simple text search with context"""
-        results = []
+        if text is None:
+            text = self._read_text(file_path)
+        if text is None:
+            return []
+
+        haystack = text if case_sensitive else text.lower()
+        search_query = query if case_sensitive else query.lower()
+        line_counts = self._count_by_line(haystack, re.compile(re.escape(search_query)))
+        return self._line_results(file_path, text, haystack, line_counts)
+
+    def _search_file_regex(self, file_path: str, pattern: str, case_sensitive: bool,
+                           text: Optional[str] = None) -> List[SearchResult]:
+        """Regex search with context"""
+        if text is None:
+            text = self._read_text(file_path)
+        if text is None:
+            return []
+
+        try:
+            flags = 0 if case_sensitive else re.IGNORECASE
+            regex = re.compile(pattern, flags)
+        except re.error:
+            return []
+
+        line_counts = self._regex_line_counts(text, regex, _regex_is_line_local(pattern, flags))
+        return self._line_results(file_path, text, text, line_counts)
+
+    def _regex_line_counts(self, text: str, regex, line_local: bool) -> dict:
+        """Count regex matches per line of text, as matching line by line would"""
+        # Whole-buffer matching gives the same matches as per-line matching
+        # unless the pattern depends on line edges or a match runs past one
+        if line_local:
+            buffer_regex = re.compile(regex.pattern, regex.flags | re.MULTILINE)
+            line_counts = self._count_by_line(text, buffer_regex, check_span=True)
+            if line_counts is not None:
+                return line_counts
+
+        line_counts = {}
+        offset = 0
+        for line_num, line in enumerate(StringIO(text).readlines(), 1):
+            matches = regex.findall(line)
+            if matches:
+                line_counts[line_num] = [len(matches), offset]
+            offset += len(line)
+        return line_counts
+
+    def _search_multi_keyword(self, file_path: str, keywords: List[str],
+                             operator: str, case_sensitive: bool,
+                             text: Optional[str] = None) -> List[SearchResult]:
+        """Multi-keyword search with AND/OR operators"""
+        if text is None:
+            text = self._read_text(file_path)
+        if text is None:
+            return []
 
+        haystack = text if case_sensitive else text.lower()
+        search_keywords = keywords if case_sensitive else [k.lower() for k in keywords]
+
+        per_keyword = self._keyword_line_counts(
+            haystack, [re.compile(re.escape(kw)) for kw in search_keywords],
+            search_keywords, operator)
+        line_counts = self._combine_keyword_counts(per_keyword, search_keywords, operator)
+        return self._line_results(file_path, text, haystack, line_counts)
+
+    def _keyword_line_counts(self, haystack, regexes: list, keywords: List[str],
+                             operator: str) -> dict:
+        """Count matches per line for each distinct keyword, one pass per keyword"""
+        per_keyword = {}
+        lines = None
+        for kw, regex in zip(keywords, regexes):
+            if kw in per_keyword:
+                continue
+            per_keyword[kw] = self._count_by_line(haystack, regex, lines=lines)
+            if operator == 'AND':
+                # Later keywords only matter on lines every earlier one matched
+                lines = set(per_keyword[kw]) if lines is None else lines & per_keyword[kw].keys()
+        return per_keyword
+
+    def _combine_keyword_counts(self, per_keyword: dict, keywords: List[str], operator: str) -> dict:
+        """Merge per-keyword line counts into lines matching the AND/OR operator"""
+        line_sets = [per_keyword[kw].keys() for kw in keywords]
+        if operator == 'AND':
+            matched = set(line_sets[0]).intersection(*line_sets[1:])
+        else:  # OR
+            matched = set().union(*line_sets)
+
+        line_counts = {}
+        for line_num in matched:
+            entries = [per_keyword[kw].get(line_num) for kw in keywords]
+            line_counts[line_num] = [sum(e[0] for e in entries if e),
+                                     min(e[1] for e in entries if e)]
+        return line_counts
+
+    def _read_text(self, file_path: str) -> Optional[str]:
+        """Read a whole file as UTF-8 text with universal newlines, or None"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+                return f.read()
         except (UnicodeDecodeError, PermissionError, FileNotFoundError, OSError):
-            return results
+            return None
 
-        search_query = query if case_sensitive else query.lower()
-        filename = os.path.basename(file_path)
+    def _count_by_line(self, haystack, regex, check_span: bool = False,
+                       lines: Optional[set] = None) -> Optional[dict]:
+        """Map line number -> [match count, first match offset] for regex over haystack.
 
-        for line_num, line in enumerate(lines, 1):
-            search_line = line if case_sensitive else line.lower()
+        With check_span, returns None as soon as a match runs past the end of
+        its line, since per-line matching could not have produced it. With
+        lines, only those line numbers are recorded.
+        """
+        newline = '\n' if isinstance(haystack, str) else b'\n'
+        line_counts = {}
+        line_num = 0
+        line_end = -1  # Offset of the newline ending the current line
+        entry = None
+        for match in regex.finditer(haystack):
+            start = match.start()
+            if start > line_end:
+                # Moved to a later line: count the newlines skipped over
+                line_num += _count_newlines(haystack, line_end + 1, start) + 1
+                line_end = haystack.find(newline, start)
+                if line_end == -1:
+                    line_end = len(haystack)
+                entry = None
+                if lines is None or line_num in lines:
+                    entry = [0, start]
+                    line_counts[line_num] = entry
+            if check_span and match.end() > line_end + 1:
+                return None
+            if entry is not None:
+                entry[0] += 1
+        return line_counts
+
+    def _line_results(self, file_path: str, text: str, haystack: str,
+                      line_counts: dict) -> List[SearchResult]:
+        """Build results for matched lines, reading line and context text from text"""
+        results = []
+        filename = os.path.basename(file_path)
 
-            if search_query in search_line:
-                match_count = search_line.count(search_query)
-                context_before = lines[line_num - 2].strip() if line_num > 1 else ""
-                context_after = lines[line_num].strip() if line_num < len(lines) else ""
+        # Lowercasing can lengthen text (e.g. 'İ'); offsets only carry over if it didn't
+        lines = text.split('\n') if len(haystack) != len(text) else None
 
-                results.append(SearchResult(
-                    file_path=file_path,
-                    file_name=filename,
-                    line_number=line_num,
-                    line_content=line.strip(),
-                    context_before=context_before,
-                    context_after=context_after,
-                    match_count=match_count
-                ))
+        for line_num in sorted(line_counts):
+            match_count, offset = line_counts[line_num]
+            if lines is not None:
+                line = lines[line_num - 1]
+                context_before = lines[line_num - 2] if line_num > 1 else ""
+                context_after = lines[line_num] if line_num < len(lines) else ""
+            else:
+                start = text.rfind('\n', 0, offset) + 1
+                end = text.find('\n', offset)
+                if end == -1:
+                    end = len(text)
+                line = text[start:end]
+                context_before = ""
+                if start > 0:
+                    context_before = text[text.rfind('\n', 0, start - 1) + 1:start - 1]
+                context_after = ""
+                if end < len(text):
+                    next_end = text.find('\n', end + 1)
+                    context_after = text[end + 1:next_end if next_end != -1 else len(text)]
+
+            results.append(SearchResult(
+                file_path=file_path,
+                file_name=filename,
+                line_number=line_num,
+                line_content=line.strip(),
+                context_before=context_before.strip(),
+                context_after=context_after.strip(),
+                match_count=match_count
+            ))
 
         return results
 
-    def _search_file_regex(self, file_path: str, pattern: str, case_sensitive: bool) -> List[SearchResult]:
-        """Regex search with context"""
-        results = []
+    def _search_large_file(self, file_path: str, query: str, case_sensitive: bool,
+                           use_regex: bool, operator: str) -> List[SearchResult]:
+        """Search a file through mmap, decoding only matched lines and their context.
 
+        Lines are split on LF only, and undecodable bytes are replaced rather
+        than skipping the file.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-        except (UnicodeDecodeError, PermissionError, FileNotFoundError, OSError):
-            return results
+            with open(file_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if use_regex and not (' ' in query and operator in ['AND', 'OR']):
+                    return self._search_mapped_regex(file_path, mm, query, case_sensitive)
+
+                if ' ' in query and operator in ['AND', 'OR']:
+                    keywords = query.split()
+                else:
+                    keywords = [query]
+                if not case_sensitive:
+                    keywords = [k.lower() for k in keywords]
+                per_keyword = self._keyword_line_counts(
+                    mm, [_bytes_regex(kw, case_sensitive) for kw in keywords], keywords, operator)
+                line_counts = self._combine_keyword_counts(per_keyword, keywords, operator)
+                return self._mapped_line_results(file_path, mm, line_counts)
+        except (OSError, ValueError):
+            return []
 
+    def _search_mapped_regex(self, file_path: str, mm, pattern: str,
+                             case_sensitive: bool) -> List[SearchResult]:
+        """Regex search over a mapped file, decoding one line-aligned chunk at a time.
+
+        A chunk is extended to the end of its last line by at most
+        SEARCH_MAX_LINE_BYTES. A longer line is searched on its own in
+        overlapping windows, so minified or single-line files are never
+        decoded whole.
+        """
         try:
             flags = 0 if case_sensitive else re.IGNORECASE
             regex = re.compile(pattern, flags)
         except re.error:
-            return results
+            return []
+        line_local = _regex_is_line_local(pattern, flags)
 
-        filename = os.path.basename(file_path)
+        results = []
+        size = len(mm)
+        start = 0
+        line_base = 0  # Lines before the current chunk
+        prev_line = ""  # Last line of the previous chunk, for context
+        while start < size:
+            limit = min(start + SEARCH_MMAP_CHUNK, size)
+            end = mm.find(b'\n', limit, limit + SEARCH_MAX_LINE_BYTES)
+            if end != -1:
+                end += 1
+            elif limit + SEARCH_MAX_LINE_BYTES >= size:
+                end = size
+            else:
+                # End the chunk before the long line, or search the line on its own
+                end = mm.rfind(b'\n', start, limit) + 1
+                if end == 0:
+                    end = mm.find(b'\n', limit)
+                    end = size if end == -1 else end + 1
+                    line = _decode_line(mm, start, end).strip()
+                    match_count = self._count_mapped_line_matches(mm, start, end, regex)
+                    if match_count:
+                        context_after = ""
+                        if end < size:
+                            next_end = mm.find(b'\n', end)
+                            context_after = _decode_line(mm, end, size if next_end == -1 else next_end)
+                        results.append(SearchResult(
+                            file_path=file_path,
+                            file_name=os.path.basename(file_path),
+                            line_number=line_base + 1,
+                            line_content=line,
+                            context_before=prev_line,
+                            context_after=context_after.strip(),
+                            match_count=match_count
+                        ))
+                    prev_line = line
+                    line_base += 1
+                    start = end
+                    continue
+            text = mm[start:end].decode('utf-8', errors='replace').replace('\r\n', '\n')
+            line_counts = self._regex_line_counts(text, regex, line_local)
+            chunk_results = self._line_results(file_path, text, text, line_counts)
+            chunk_lines = text.count('\n')
+
+            # Context lines across chunk edges come from the neighbouring chunks
+            if chunk_results:
+                if start > 0 and chunk_results[0].line_number == 1:
+                    chunk_results[0].context_before = prev_line
+                if end < size and chunk_results[-1].line_number == chunk_lines:
+                    next_end = mm.find(b'\n', end)
+                    chunk_results[-1].context_after = _decode_line(
+                        mm, end, size if next_end == -1 else next_end).strip()
+                for result in chunk_results:
+                    result.line_number += line_base
+                results.extend(chunk_results)
+
+            prev_line = text[text.rfind('\n', 0, len(text) - 1) + 1:].strip()
+            line_base += chunk_lines
+            start = end
+        return results
 
-        for line_num, line in enumerate(lines, 1):
-            matches = regex.findall(line)
-            if matches:
-                match_count = len(matches)
-                context_before = lines[line_num - 2].strip() if line_num > 1 else ""
-                context_after = lines[line_num].strip() if line_num < len(lines) else ""
+    def _count_mapped_line_matches(self, mm, start: int, end: int, regex) -> int:
+        """Count regex matches in one line of a mapped file, start to end (newline included).
 
-                results.append(SearchResult(
-                    file_path=file_path,
-                    file_name=filename,
-                    line_number=line_num,
-                    line_content=line.strip(),
-                    context_before=context_before,
-                    context_after=context_after,
-                    match_count=match_count
-                ))
+        The line is decoded in windows of SEARCH_MMAP_CHUNK that overlap by
+        SEARCH_MAX_LINE_BYTES, so matches up to that long are found across a
+        window edge. Each match is counted in the window where it ends.
+        """
+        count = 0
+        window_start = start  # Start of the overlap with the previous window
+        boundary = start  # Matches ending before this were counted already
+        while boundary < end:
+            window_end = min(boundary + SEARCH_MMAP_CHUNK, end)
+            if window_end < end:
+                window_end = _utf8_char_start(mm, window_end, boundary + 1)
+            overlap = mm[window_start:boundary].decode('utf-8', errors='replace')
+            text = overlap + mm[boundary:window_end].decode('utf-8', errors='replace')
+            last = window_end == end
+            if last and text.endswith('\r\n'):
+                text = text[:-2] + '\n'
+            # Only the first window starts at the line start, where '^' may match
+            for match in regex.finditer(text, 0 if boundary == start else 1):
+                if match.end() >= len(overlap) and (last or match.end() < len(text)):
+                    count += 1
+            window_start = _utf8_char_start(mm, max(window_end - SEARCH_MAX_LINE_BYTES, start), start)
+            boundary = window_end
+        return count
+
+    def _mapped_line_results(self, file_path: str, mm, line_counts: dict) -> List[SearchResult]:
+        """Build results for matched lines of a mapped file"""
+        results = []
+        filename = os.path.basename(file_path)
+        size = len(mm)
+
+        for line_num in sorted(line_counts):
+            match_count, offset = line_counts[line_num]
+            start = mm.rfind(b'\n', 0, offset) + 1
+            end = mm.find(b'\n', offset)
+            if end == -1:
+                end = size
+            context_before = ""
+            if start > 0:
+                context_before = _decode_line(mm, mm.rfind(b'\n', 0, start - 1) + 1, start - 1)
+            context_after = ""
+            if end < size:
+                next_end = mm.find(b'\n', end + 1)
+                context_after = _decode_line(mm, end + 1, size if next_end == -1 else next_end)
+
+            results.append(SearchResult(
+                file_path=file_path,
+                file_name=filename,
+                line_number=line_num,
+                line_content=_decode_line(mm, start, end).strip(),
+                context_before=context_before.strip(),
+                context_after=context_after.strip(),
+                match_count=match_count
+            ))
 
         return results
 
-    def _search_multi_keyword(self, file_path: str, keywords: List[str],
-                             operator: str, case_sensitive: bool) -> List[SearchResult]:
-        """Multi-keyword search with AND/OR operators"""
-        results = []
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-        except (UnicodeDecodeError, PermissionError, FileNotFoundError, OSError):
-            return results
+class RankedResults:
+    """Search results in relevance order, handed out a page at a time.
 
-        filename = os.path.basename(file_path)
+    Scored results sit in a heap and only the pages actually shown are
+    popped, so a query with 100k matches never sorts or renders them all.
+    Without scores, results keep their original order.
+    """
 
-        for line_num, line in enumerate(lines, 1):
-            search_line = line if case_sensitive else line.lower()
-            search_keywords = keywords if case_sensitive else [k.lower() for k in keywords]
+    PAGE_SIZE = 100         # Results rendered per page of the list view
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    HEADING_BOOST = 1.0     # Markdown heading lines
+    FILENAME_BOOST = 2.0    # Lines of files whose name matched the query
+    LINE_WEIGHT = 0.25      # Per-line match count, to order lines within a file
 
-            if operator == 'AND':
-                match = all(kw in search_line for kw in search_keywords)
-            else:  # OR
-                match = any(kw in search_line for kw in search_keywords)
+    def __init__(self, results: List[SearchResult], scores: Optional[List[float]] = None):
+        self.results = results
+        self._scores = scores
+        self.rewind()
+
+    def rewind(self):
+        """Start paging again from the best result"""
+        self.shown = 0
+        self._heap = None
+        if self._scores is not None:
+            # Ties keep the original (file, line) order
+            self._heap = [(-score, seq) for seq, score in enumerate(self._scores)]
+            heapq.heapify(self._heap)
+
+    def next_page(self, size: Optional[int] = None) -> List[SearchResult]:
+        """Return the next page of results"""
+        size = size or self.PAGE_SIZE
+        if self._heap is None:
+            page = self.results[self.shown:self.shown + size]
+        else:
+            count = min(size, len(self._heap))
+            page = [self.results[heapq.heappop(self._heap)[1]] for _ in range(count)]
+        self.shown += len(page)
+        return page
 
-            if match:
-                match_count = sum(search_line.count(kw) for kw in search_keywords)
-                context_before = lines[line_num - 2].strip() if line_num > 1 else ""
-                context_after = lines[line_num].strip() if line_num < len(lines) else ""
+    @property
+    def remaining(self) -> int:
+        return len(self.results) - self.shown
 
-                results.append(SearchResult(
-                    file_path=file_path,
-                    file_name=filename,
-                    line_number=line_num,
-                    line_content=line.strip(),
-                    context_before=context_before,
-                    context_after=context_after,
-                    match_count=match_count
-                ))
+    def copy(self) -> 'RankedResults':
+        """Independent pager over a copy of the same results"""
+        return RankedResults(list(self.results), self._scores)
 
-        return results
+
+def _count_newlines(buffer, start: int, end: int) -> int:
+    """Count LF between start and end of a str or mmap, in bounded slices for mmap"""
+    if isinstance(buffer, str):
+        return buffer.count('\n', start, end)
+    count = 0
+    while start < end:
+        stop = min(start + SEARCH_MMAP_CHUNK, end)
+        count += buffer[start:stop].count(b'\n')
+        start = stop
+    return count
+
+
+def _decode_line(mm, start: int, end: int) -> str:
+    """Decode one line of a mapped file, capped at SEARCH_MAX_LINE_BYTES"""
+    return mm[start:min(end, start + SEARCH_MAX_LINE_BYTES)].decode('utf-8', errors='replace')
+
+
+def _utf8_char_start(mm, pos: int, floor: int) -> int:
+    """Move pos back to the start of the UTF-8 character it falls in, not below floor"""
+    while pos > floor and mm[pos] & 0xC0 == 0x80:
+        pos -= 1
+    return pos
+
+
+def _bytes_regex(keyword: str, case_sensitive: bool):
+    """Compile a UTF-8 bytes regex matching keyword, optionally ignoring case.
+
+    keyword must already be lowercased when ignoring case; each character then
+    matches any single character that lowercases to it. ASCII folding is left
+    to re.IGNORECASE, which only applies to ASCII in bytes patterns.
+    """
+    if case_sensitive:
+        return re.compile(re.escape(keyword.encode('utf-8')))
+    parts = []
+    for ch in keyword:
+        if ch.isascii():
+            parts.append(re.escape(ch.encode('ascii')))
+            continue
+        variants = {v for v in (ch, ch.upper(), ch.title()) if len(v) == 1 and v.lower() == ch}
+        encoded = sorted(re.escape(v.encode('utf-8')) for v in variants)
+        if len(encoded) == 1:
+            parts.append(encoded[0])
+        else:
+            parts.append(b'(?:' + b'|'.join(encoded) + b')')
+    return re.compile(b''.join(parts), re.IGNORECASE)
+
+
+def _scan_shard(items: List[tuple], query: str, case_sensitive: bool, use_regex: bool,
+                search_filenames: bool, operator: str) -> tuple:
+    """Search a shard of (path, size) files in a worker process.
+
+    Also returns {path: (content_hash, trigrams)} so the caller can build the
+    search index from the same pass. Each file is read once, for both.
+    """
+    engine = SearchEngine()
+    results = []
+    scanned = {}
+    for file_path, size in items:
+        digest, trigrams, text = SearchIndex._read_file_text(file_path, size)
+        if trigrams is not None:
+            trigrams = array('Q', trigrams)  # Compact to pickle back to the parent
+        scanned[file_path] = (digest, trigrams)
+        undecodable = trigrams is not None and text is None  # Its content never matches
+        results.extend(engine._search_path(file_path, query, case_sensitive, use_regex,
+                                           search_filenames, operator, filename_only=undecodable,
+                                           size=size, text=text))
+    return results, scanned
 
 
 @dataclass
@@ -395,6 +2120,509 @@ class BookmarkManager:
             return False
 
 
+# --- CSV Table ---
+
+CSV_INDEX_VERSION = 1
+CSV_INDEX_CHUNK = 4 * 1024 * 1024             # Bytes read at a time while indexing rows
+CSV_BACKGROUND_INDEX_SIZE = 1024 * 1024       # Larger files are indexed in a worker thread and cached
+CSV_MAX_WINDOW_ROWS = 1000                    # Most rows served to the page per request
+CSV_COLUMNS_BATCH = 65536                     # Rows parsed at a time while building columns
+# Values a numeric column may hold: unlike float(), no nan, inf or 1_000
+CSV_NUMBER = re.compile(r'\s*[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?\s*', re.ASCII)
+
+
+def index_csv_rows(f, is_cancelled=None) -> Optional[array]:
+    """Byte offset of every row start in a binary CSV file object.
+
+    Newlines inside quoted fields do not start a row; a field's quotes
+    always come in pairs, so the quote count parity tells them apart.
+    Returns None if is_cancelled() turns true between chunks.
+    """
+    offsets = array('Q', [0])
+    quoted = 0
+    position = 0
+    while True:
+        if is_cancelled and is_cancelled():
+            return None
+        chunk = f.read(CSV_INDEX_CHUNK)
+        if not chunk:
+            break
+        start = 0
+        newline = chunk.find(b'\n')
+        while newline != -1:
+            quoted ^= chunk.count(b'"', start, newline) & 1
+            start = newline + 1
+            if not quoted:
+                offsets.append(position + start)
+            newline = chunk.find(b'\n', start)
+        quoted ^= chunk.count(b'"', start) & 1
+        position += len(chunk)
+    if offsets[-1] == position:
+        offsets.pop()  # Trailing newline (or empty file)
+    return offsets
+
+
+def read_csv_header(file_path: str) -> List[str]:
+    """First row of a CSV file, read without indexing the rest"""
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f), [])
+
+
+class CsvTable:
+    """Row access to a CSV file through an index of row byte offsets.
+
+    Only the rows asked for are read and parsed, so a table of any size
+    costs the offsets plus one window of rows.
+    """
+
+    def __init__(self, file_path: str, offsets: array):
+        self.file_path = file_path
+        self.offsets = offsets
+        self.header = self.rows(0, 1)[0] if self.offsets else []
+        self.columns = None  # CsvColumns, built on first sort, filter or statistics
+
+    @classmethod
+    def from_file(cls, file_path: str, is_cancelled=None) -> Optional['CsvTable']:
+        """Index the rows of a CSV file (None if cancelled)"""
+        with open(file_path, 'rb') as f:
+            offsets = index_csv_rows(f, is_cancelled)
+        return None if offsets is None else cls(file_path, offsets)
+
+    @property
+    def row_count(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def column_count(self) -> int:
+        return len(self.header)
+
+    def rows(self, start: int, end: int) -> List[List[str]]:
+        """Parsed rows start to end (0-indexed, end exclusive)"""
+        start = max(start, 0)
+        end = min(end, len(self.offsets))
+        if start >= end:
+            return []
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.offsets[start])
+            if end < len(self.offsets):
+                data = f.read(self.offsets[end] - self.offsets[start])
+            else:
+                data = f.read()
+        text = data.decode('utf-8-sig' if start == 0 else 'utf-8')
+        return list(csv.reader(StringIO(text)))
+
+    def rows_at(self, row_numbers) -> List[List[str]]:
+        """Parsed rows at the given row numbers, in that order (one seek each)"""
+        offsets = self.offsets
+        texts = []
+        with open(self.file_path, 'rb') as f:
+            for row in row_numbers:
+                if not 0 <= row < len(offsets):
+                    continue
+                f.seek(offsets[row])
+                if row + 1 < len(offsets):
+                    data = f.read(offsets[row + 1] - offsets[row])
+                else:
+                    data = f.read()
+                text = data.decode('utf-8-sig' if row == 0 else 'utf-8')
+                texts.append(text if text.endswith('\n') else text + '\n')
+        return list(csv.reader(StringIO(''.join(texts))))
+
+
+@dataclass
+class CsvColumn:
+    """One column of a CSV table, dictionary encoded"""
+    name: str
+    codes: array              # Code of each data row's value ('I'); 0 is the empty value
+    values: List[str]         # Distinct values by code
+    numbers: Optional[array]  # Value of each code as a number ('d') if all are numeric
+
+
+@dataclass
+class CsvTableView:
+    """Sort, filter and statistics shown on a CSV table page"""
+    sort_column: int = -1
+    descending: bool = False
+    filter_column: int = -1  # -1 matches any column
+    filter_text: str = ''
+    stats_column: int = -1
+
+
+class CsvColumns:
+    """Columnar copy of a CSV table's data rows for sorting, filtering and statistics.
+
+    Each cell is a 4-byte code into its column's distinct values, so a
+    column costs one array plus its distinct strings instead of a string
+    object per cell. Rows are still read from the file for display.
+    """
+
+    def __init__(self, columns: List[CsvColumn], row_count: int):
+        self.columns = columns
+        self.row_count = row_count
+
+    @classmethod
+    def from_table(cls, table: CsvTable, is_cancelled=None) -> Optional['CsvColumns']:
+        """Build the columns in one streaming pass over the file (None if cancelled)"""
+        width = table.column_count
+        indexes = [{'': 0} for _ in range(width)]
+        codes = [array('I') for _ in range(width)]
+        row_count = 0
+        with open(table.file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Header
+            while True:
+                if is_cancelled and is_cancelled():
+                    return None
+                batch = list(islice(reader, CSV_COLUMNS_BATCH))
+                if not batch:
+                    break
+                row_count += len(batch)
+                cells = list(zip_longest(*batch, fillvalue=''))
+                for i in range(width):
+                    column = cells[i] if i < len(cells) else ('',) * len(batch)
+                    index = indexes[i]
+                    for value in set(column).difference(index):
+                        index[value] = len(index)
+                    codes[i].extend(map(index.__getitem__, column))
+
+        columns = []
+        for name, index, column_codes in zip(table.header, indexes, codes):
+            values = list(index)  # Insertion order is code order
+            numbers = cls._numbers(values)
+            columns.append(CsvColumn(name, column_codes, values, numbers))
+        return cls(columns, row_count)
+
+    @staticmethod
+    def _numbers(values: List[str]) -> Optional[array]:
+        """Each value as a number, or None unless every non-empty value is a finite number"""
+        if not all(map(CSV_NUMBER.fullmatch, values[1:])):
+            return None
+        numbers = array('d', [math.nan])
+        numbers.extend(map(float, values[1:]))
+        if not all(map(math.isfinite, numbers[1:])):
+            return None  # Overflows such as 1e999
+        return numbers
+
+    def summary(self, column: int) -> dict:
+        """Type, min, max, distinct and null count of a column"""
+        col = self.columns[column]
+        values = col.values
+        nulls = col.codes.count(0)
+        present = range(1, len(values))
+        if not present:
+            low = high = ''
+        elif col.numbers is not None:
+            low = values[min(present, key=col.numbers.__getitem__)]
+            high = values[max(present, key=col.numbers.__getitem__)]
+        else:
+            low = min(values[1:])
+            high = max(values[1:])
+        return {
+            'column': column,
+            'name': col.name,
+            'type': 'number' if col.numbers is not None and present else 'text',
+            'min': low,
+            'max': high,
+            'distinct': len(values) - 1,
+            'nulls': nulls,
+            'rows': self.row_count,
+        }
+
+    def _sort_keys(self, col: CsvColumn) -> array:
+        """Sort key of each code: the number, or the rank of the text"""
+        if col.numbers is not None:
+            return col.numbers
+        folded = [value.casefold() for value in col.values]
+        ranks = array('I', bytes(4 * len(folded)))
+        for rank, code in enumerate(sorted(range(len(folded)), key=folded.__getitem__)):
+            ranks[code] = rank
+        return ranks
+
+    def _matches(self, column: int, text: str) -> bytes:
+        """One byte per row, 1 where the column contains text (any case)"""
+        col = self.columns[column]
+        needle = text.casefold()
+        matching = bytes(needle in value.casefold() for value in col.values)
+        return bytes(map(matching.__getitem__, col.codes))
+
+    def row_order(self, view: CsvTableView) -> Optional[array]:
+        """Data row numbers in display order ('I'), or None for file order.
+
+        Sorting keeps empty values last in either direction.
+        """
+        order = None
+        if 0 <= view.sort_column < len(self.columns):
+            col = self.columns[view.sort_column]
+            code_keys = self._sort_keys(col)
+            row_keys = array(code_keys.typecode, map(code_keys.__getitem__, col.codes))
+            present = list(compress(range(self.row_count), col.codes))
+            present.sort(key=row_keys.__getitem__, reverse=view.descending)
+            order = array('I', present)
+            order.extend(compress(range(self.row_count), map((0).__eq__, col.codes)))
+
+        if view.filter_text:
+            if 0 <= view.filter_column < len(self.columns):
+                mask = self._matches(view.filter_column, view.filter_text)
+            else:
+                combined = 0
+                for column in range(len(self.columns)):
+                    combined |= int.from_bytes(self._matches(column, view.filter_text), 'big')
+                mask = combined.to_bytes(self.row_count, 'big')
+            if order is None:
+                order = array('I', compress(range(self.row_count), mask))
+            else:
+                order = array('I', compress(order, map(mask.__getitem__, order)))
+        return order
+
+
+class CsvIndexCache:
+    """Row indexes of large CSV files, kept on disk between sessions.
+
+    Stored under ~/.markdown-viewer/csv_index/ keyed by a hash of the file
+    path. Layout: header (with the indexed file's mtime_ns and size), then
+    one uint64 offset per row. An index whose file has changed since is
+    ignored, and least recently used indexes are dropped beyond the limits.
+    """
+
+    MAGIC = b'MVCI'
+    HEADER = struct.Struct('<4sIqQQ')  # magic, version, mtime_ns, size, row count
+    CACHE_MAX_FILES = 64
+    CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = cache_dir or Path.home() / ".markdown-viewer" / "csv_index"
+
+    def _index_file(self, file_path: str) -> Path:
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(file_path)).encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / f"{key}.idx"
+
+    def load(self, file_path: str) -> Optional[CsvTable]:
+        """The cached table of a file, if its index matches the file on disk"""
+        index_file = self._index_file(file_path)
+        try:
+            st = os.stat(file_path)
+            with open(index_file, 'rb') as f:
+                magic, version, mtime_ns, size, row_count = self.HEADER.unpack(f.read(self.HEADER.size))
+                if (magic != self.MAGIC or version != CSV_INDEX_VERSION
+                        or mtime_ns != st.st_mtime_ns or size != st.st_size):
+                    return None
+                offsets = array('Q')
+                offsets.fromfile(f, row_count)
+            os.utime(index_file)  # Most recently used survives pruning
+            return CsvTable(file_path, offsets)
+        except (OSError, EOFError, struct.error, UnicodeDecodeError):
+            return None
+
+    def save(self, file_path: str, mtime_ns: int, size: int, offsets: array):
+        """Store the index of a file version, replacing any older one"""
+        index_file = self._index_file(file_path)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with atomic_write(index_file, binary=True) as f:
+                f.write(self.HEADER.pack(self.MAGIC, CSV_INDEX_VERSION, mtime_ns, size, len(offsets)))
+                offsets.tofile(f)
+            prune_cache_dir(self.cache_dir, '.idx', self.CACHE_MAX_FILES, self.CACHE_MAX_BYTES)
+        except OSError as e:
+            print(f"Error saving CSV index: {e}")
+
+
+# --- XML Outline ---
+
+XML_OUTLINE_SIZE = 2 * 1024 * 1024            # Larger XML files open as an element outline, not as source
+XML_OUTLINE_CHUNK = 1024 * 1024               # Bytes fed to the parser at a time
+XML_OUTLINE_CHILDREN = 200                    # Child elements listed per request
+XML_SOURCE_BYTES = 64 * 1024                  # Source shown when jumping to an element
+XML_DECLARED_ENCODING = re.compile(rb'<\?xml[^>]*encoding=["\']([A-Za-z0-9._-]+)')
+
+
+@dataclass
+class XmlNode:
+    """Element of an XML outline, located by its start tag"""
+    name: str
+    attributes: str  # Attributes as written, shortened
+    text: str  # Start of the element's own text
+    offset: int  # Byte offset of the start tag
+    line: int
+    has_children: bool = False
+
+
+class _XmlScanDone(Exception):
+    """Raised from parser handlers to stop reading once a listing is complete"""
+
+
+class XmlOutline:
+    """Element tree of an XML file, read lazily one level at a time.
+
+    Nothing is kept per element. Listing the children of an element parses
+    the file from its start tag (with expat, which reports byte offsets)
+    until enough children have been seen. A listing that stops early keeps
+    a resume point: the offset, line and names of the open elements there,
+    which are fed to a new parser as bare start tags ahead of the rest of
+    the file. Memory use therefore does not grow with the file.
+    """
+
+    ATTRIBUTES_MAX = 160
+    TEXT_MAX = 80
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            match = XML_DECLARED_ENCODING.search(f.read(256))
+        self.encoding = match.group(1).decode('ascii') if match else 'utf-8'
+        self._resume_points = {}  # Resume id -> (offset, line, open element names)
+        self._next_resume = 0
+
+    def root(self) -> XmlNode:
+        """The document element"""
+        root, _, _ = self._scan(0, 1, [], 0)
+        if root is None:
+            raise ValueError("No root element found")
+        return root
+
+    def children(self, offset: int, line: int, resume: Optional[int] = None, is_cancelled=None, on_nodes=None):
+        """Up to XML_OUTLINE_CHILDREN child elements of the element at offset
+
+        With a resume id, continues the listing where it stopped instead.
+        Returns (nodes, resume id or None once all are listed), or None when
+        cancelled. Children found while a large sibling is still being read
+        are passed to on_nodes as they are complete and left out of the result.
+        """
+        open_names = []
+        if resume is not None:
+            offset, line, open_names = self._resume_points.pop(resume)
+        result = self._scan(offset, line, open_names, XML_OUTLINE_CHILDREN, is_cancelled, on_nodes)
+        if result is None:
+            return None
+        _, nodes, resume_point = result
+        if resume_point is None:
+            return nodes, None
+        resume = self._next_resume
+        self._next_resume += 1
+        self._resume_points[resume] = resume_point
+        return nodes, resume
+
+    def can_resume(self, resume: int) -> bool:
+        """Whether a listing can continue from a resume id (each continues once)"""
+        return resume in self._resume_points
+
+    def source(self, offset: int) -> str:
+        """Source text from the start tag at offset, cut at a line end"""
+        with open(self.file_path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(XML_SOURCE_BYTES)
+        end = data.rfind(b'\n')
+        if end > 0 and len(data) == XML_SOURCE_BYTES:
+            data = data[:end]
+        return data.decode(self.encoding, errors='replace')
+
+    def _scan(self, offset: int, line: int, open_names: List[str], limit: int, is_cancelled=None, on_nodes=None):
+        """Parse from offset, listing children of the element open at depth 1
+
+        Without open_names the file must start an element at offset (that
+        element is the parent). Returns (parent node if read from the file,
+        children not passed to on_nodes, resume point or None), or None when
+        cancelled.
+        """
+        prefix = ''.join(f'<{name}>' for name in open_names).encode(self.encoding)
+        parser = xml.parsers.expat.ParserCreate(None if self.encoding.lower() == 'utf-8' else self.encoding)
+        parser.UseForeignDTD(True)  # Entities of a DTD before offset are skipped, not errors
+        parser.buffer_text = True
+        depth = 0  # Open elements, the parent being the first
+        names = []  # Names of the open parent and child, for resume points
+        nodes = []
+        parent = None
+        child = None  # Child read from the file that is open
+        text = []
+        resume_point = None
+        passed = 0  # Nodes already handed to on_nodes
+
+        def node_at(name, attributes):
+            attributes = ' '.join(f'{key}="{value}"' for key, value in attributes.items())
+            if len(attributes) > self.ATTRIBUTES_MAX:
+                attributes = attributes[:self.ATTRIBUTES_MAX] + '…'
+            return XmlNode(name, attributes, '', offset + parser.CurrentByteIndex - len(prefix),
+                           line + parser.CurrentLineNumber - 1)
+
+        def resume_here(open_names):
+            return (offset + parser.CurrentByteIndex - len(prefix),
+                    line + parser.CurrentLineNumber - 1, open_names)
+
+        def start(name, attributes):
+            nonlocal depth, parent, child, resume_point
+            depth += 1
+            if depth > 3:
+                return  # Most elements: inside a grandchild, only counted
+            if depth == 3:
+                if child is not None and not child.has_children:
+                    child.has_children = True
+                    if len(nodes) >= limit:
+                        # The last child may be large: continue inside it later
+                        resume_point = resume_here(names[:2])
+                        raise _XmlScanDone()
+                return
+            names.append(name)
+            if parser.CurrentByteIndex < len(prefix):
+                return  # Reopened from the resume point
+            if depth == 1:
+                parent = node_at(name, attributes)
+                return
+            if parent is not None:
+                parent.has_children = True
+            if len(nodes) >= limit:
+                resume_point = resume_here(names[:1])
+                raise _XmlScanDone()
+            child = node_at(name, attributes)
+            nodes.append(child)
+            text.clear()
+
+        def end(name):
+            nonlocal depth, child
+            depth -= 1
+            if depth >= 2:
+                return
+            names.pop()
+            if depth == 1 and child is not None:
+                child.text = self._shorten(''.join(text))
+                child = None
+            elif depth == 0:
+                raise _XmlScanDone()
+
+        def character_data(data):
+            if depth == 2 and child is not None and sum(map(len, text)) < self.TEXT_MAX * 4:
+                text.append(data)
+
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = character_data
+        try:
+            parser.Parse(prefix, False)
+            with open(self.file_path, 'rb') as f:
+                f.seek(offset)
+                while True:
+                    if is_cancelled and is_cancelled():
+                        return None
+                    data = f.read(XML_OUTLINE_CHUNK)
+                    parser.Parse(data, not data)
+                    if not data:
+                        break
+                    # A child still being read is shown once its children are known
+                    ready = nodes[passed:len(nodes) - (child is not None and not child.has_children)]
+                    if on_nodes and ready:
+                        if ready[-1] is child:
+                            ready[-1] = replace(child, text=self._shorten(''.join(text)))
+                        on_nodes(ready)
+                        passed += len(ready)
+        except _XmlScanDone:
+            pass
+        if child is not None:
+            child.text = self._shorten(''.join(text))
+        return parent, nodes[passed:], resume_point
+
+    def _shorten(self, text: str) -> str:
+        text = ' '.join(text.split())
+        return text if len(text) <= self.TEXT_MAX else text[:self.TEXT_MAX] + '…'
+
+
 # --- CDXML to SVG Converter ---
 
 ELEMENT_SYMBOLS = {
@@ -583,7 +2811,11 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineSettings
-from PyQt6.QtCore import Qt, QModelIndex, QTimer, QUrl, pyqtSignal, QRect, QFileSystemWatcher
+from PyQt6.QtWebChannel import QWebChannel
+from PyQt6.QtCore import (
+    Qt, QModelIndex, QTimer, QUrl, pyqtSignal, pyqtSlot, QRect, QFileSystemWatcher, QThread,
+    QObject
+)
 from PyQt6.QtGui import (
     QAction, QFileSystemModel, QShortcut, QKeySequence, QCloseEvent,
     QDesktopServices, QPainter, QColor, QFont, QBrush, QPixmap, QIcon
@@ -872,28 +3104,455 @@ class MarkdownWebPage(QWebEnginePage):
     """Custom WebEnginePage to handle link clicks"""
     link_clicked = pyqtSignal(str, bool)  # (url, open_in_new_tab)
 
-    def acceptNavigationRequest(self, url: QUrl, nav_type, is_main_frame: bool) -> bool:
-        try:
-            # Only intercept link clicks
-            if nav_type == QWebEnginePage.NavigationType.NavigationTypeLinkClicked:
-                url_str = url.toString()
+    def acceptNavigationRequest(self, url: QUrl, nav_type, is_main_frame: bool) -> bool:
+        try:
+            # Only intercept link clicks
+            if nav_type == QWebEnginePage.NavigationType.NavigationTypeLinkClicked:
+                url_str = url.toString()
+
+                # Allow anchor navigation within the same page
+                if url_str.startswith('#') or (url.hasFragment() and url.path() == ''):
+                    return True
+
+                # Check if Shift is pressed for new tab
+                modifiers = QApplication.keyboardModifiers()
+                new_tab = bool(modifiers & Qt.KeyboardModifier.ShiftModifier)
+
+                # Defer signal emission to avoid crash during navigation request
+                QTimer.singleShot(0, lambda u=url_str, n=new_tab: self.link_clicked.emit(u, n))
+                return False  # Prevent default navigation
+
+            return True
+        except Exception as e:
+            print(f"Error in navigation request: {e}")
+            return False
+
+
+class DocumentBridge(QObject):
+    """Markdown document of a tab, pulled by its viewer page over QWebChannel.
+
+    The page fetches the source and line info when it renders and raw lines
+    only when they are copied, so the document is never escaped into script
+    text or sent twice. Rendered Mermaid SVGs are kept for all tabs, keyed
+    by a digest of the diagram source. CSV pages pull windows of table rows
+    the same way, and code pages fetch their source and fetch or hand back
+    highlighted chunks.
+    """
+
+    DIAGRAM_CACHE_SIZE = 256
+    _diagram_svgs = OrderedDict()  # Shared by all tabs: source digest -> SVG
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._serial = 0
+        self._document = {}
+        self._source_map = None
+        self._lines = []
+        self._table = None
+        self._row_order = None
+        self._code = ''
+        self._code_chunks = []
+        self._store_code = None
+        self._highlighter = ''
+
+    def set_document(self, document: dict, source_map: MarkdownSourceMap, lines: List[str]) -> int:
+        """Replace the served document and return its serial number"""
+        self._serial += 1
+        self._document = dict(document, serial=self._serial, lineCount=len(lines))
+        self._source_map = source_map
+        self._lines = lines
+        self._table = None
+        self._row_order = None
+        self._code = ''
+        self._code_chunks = []
+        self._store_code = None
+        return self._serial
+
+    def set_table(self, table: CsvTable):
+        """Serve the rows of a CSV table"""
+        self._table = table
+        self._row_order = None
+
+    def set_row_order(self, row_order: Optional[array]):
+        """Serve the table's data rows in this order (None for file order)"""
+        self._row_order = row_order
+
+    def set_code(self, code: str, chunks: Optional[List[str]],
+                 store: Optional[Callable[[List[str]], None]], highlighter: str = '') -> int:
+        """Serve source code with its cached highlighted chunks, or call store with the page's own once
+
+        highlighter is the highlight.js script, for a page whose cached
+        chunks turn out not to fit. Returns the serial number the page sends
+        back with its chunks.
+        """
+        self._serial += 1
+        self._code = code
+        self._code_chunks = chunks or []
+        self._store_code = store
+        self._highlighter = highlighter
+        return self._serial
+
+    def clear(self):
+        """Forget the served document"""
+        self._document = {}
+        self._source_map = None
+        self._lines = []
+        self._table = None
+        self._row_order = None
+        self._code = ''
+        self._code_chunks = []
+        self._store_code = None
+
+    @pyqtSlot(result='QVariantMap')
+    def getDocument(self) -> dict:
+        return self._document
+
+    @pyqtSlot(result='QVariantMap')
+    def getSourceMap(self) -> dict:
+        if self._source_map is None:
+            return {'lines': [], 'types': ''}
+        return {'lines': self._source_map.lines.tolist(), 'types': self._source_map.types}
+
+    @pyqtSlot(str, int, int)
+    def copyRawLines(self, reference: str, start: int, end: int):
+        """Copy source lines start to end (1-indexed, inclusive) under a file:line reference"""
+        lines = self._lines[max(start - 1, 0):max(end, 0)]
+        QApplication.clipboard().setText('\n'.join([reference] + lines))
+
+    @pyqtSlot(int, int, result='QVariantList')
+    def getTableRows(self, start: int, end: int) -> list:
+        """CSV data rows start to end (0-indexed after the header, end exclusive)
+
+        Positions are in the sorted and filtered order when one is set.
+        """
+        if self._table is None:
+            return []
+        end = min(end, start + CSV_MAX_WINDOW_ROWS)
+        try:
+            if self._row_order is not None:
+                return self._table.rows_at(row + 1 for row in self._row_order[max(start, 0):end])
+            return self._table.rows(start + 1, end + 1)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading CSV rows: {e}")
+            return []
+
+    @pyqtSlot(result=str)
+    def getCode(self) -> str:
+        return self._code
+
+    @pyqtSlot(result='QStringList')
+    def getHighlightedCode(self) -> List[str]:
+        return self._code_chunks
+
+    @pyqtSlot(int, result=str)
+    def dropHighlightedCode(self, serial: int) -> str:
+        """Forget cached chunks that do not fit the page; returns highlight.js to redo them"""
+        if serial != self._serial:
+            return ''
+        self._code_chunks = []
+        return self._highlighter
+
+    @pyqtSlot(int, 'QStringList')
+    def storeHighlightedCode(self, serial: int, chunks: List[str]):
+        """Highlighted chunks of the code page shown for serial"""
+        if serial != self._serial or self._store_code is None:
+            return
+        store, self._store_code = self._store_code, None
+        store(chunks)
+
+    @staticmethod
+    def _diagram_key(source: str) -> str:
+        return hashlib.blake2b(source.encode('utf-8'), digest_size=16).hexdigest()
+
+    @pyqtSlot(str, result=str)
+    def getDiagramSvg(self, source: str) -> str:
+        """Cached SVG of a Mermaid diagram ('' when not rendered yet)"""
+        key = self._diagram_key(source)
+        svg = self._diagram_svgs.get(key)
+        if svg is None:
+            return ''
+        self._diagram_svgs.move_to_end(key)
+        return svg
+
+    @pyqtSlot(str, str)
+    def storeDiagramSvg(self, source: str, svg: str):
+        key = self._diagram_key(source)
+        self._diagram_svgs[key] = svg
+        self._diagram_svgs.move_to_end(key)
+        while len(self._diagram_svgs) > self.DIAGRAM_CACHE_SIZE:
+            self._diagram_svgs.popitem(last=False)
+
+
+class ViewerWebView(QWebEngineView):
+    """Web view of a tab: link-handling page plus the document bridge.
+
+    Views can be created ahead of time by WebViewPool and move between
+    tabs, so nothing here refers to a tab.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.web_page = MarkdownWebPage(self)
+        self.setPage(self.web_page)
+        self.setMinimumWidth(600)
+
+        # Markdown pages pull the current document from Python
+        self.document_bridge = DocumentBridge(self)
+        self.web_channel = QWebChannel(self.web_page)
+        self.web_channel.registerObject('documentBridge', self.document_bridge)
+        self.web_page.setWebChannel(self.web_channel)
+
+        # Allow local content to access remote URLs (for CDN scripts)
+        self.settings().setAttribute(
+            QWebEngineSettings.WebAttribute.LocalContentCanAccessRemoteUrls, True
+        )
+
+        # Enable context menu for right-click
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+
+        self.has_shell = False  # Markdown viewer shell loaded (or loading) by the pool
+        self.shell_loading = False
+        self.loadFinished.connect(self._on_load_finished)
+
+    def load_shell(self, html: str, base_url: QUrl):
+        """Start loading the Markdown viewer shell"""
+        self.has_shell = True
+        self.shell_loading = True
+        self.setHtml(html, base_url)
+
+    def _on_load_finished(self, ok: bool):
+        self.shell_loading = False
+
+
+class WebViewPool(QObject):
+    """Web views created ahead of time with the Markdown shell already loaded.
+
+    Spinning up a renderer process and parsing marked.js takes a noticeable
+    moment per view; new tabs claim a warm view instead and closed tabs hand
+    theirs back, so opening a tab does not wait for either.
+    """
+
+    POOL_SIZE = 2
+    REFILL_DELAY = 1000  # Milliseconds after a view is claimed before replacing it
+
+    def __init__(self, shell_html: str, parent=None):
+        super().__init__(parent)
+        self._shell_html = shell_html
+        self._shell_base_url = QUrl.fromLocalFile(str(get_resource_path("templates")) + '/')
+        self._idle = []
+
+    def fill(self):
+        """Create views until the pool is full"""
+        while len(self._idle) < self.POOL_SIZE:
+            view = ViewerWebView()
+            view.load_shell(self._shell_html, self._shell_base_url)
+            self._idle.append(view)
+
+    def acquire(self) -> ViewerWebView:
+        """A view with the shell loaded or loading; the pool refills later"""
+        if self._idle:
+            view = self._idle.pop(0)
+        else:
+            view = ViewerWebView()
+            view.load_shell(self._shell_html, self._shell_base_url)
+        QTimer.singleShot(self.REFILL_DELAY, self.fill)
+        return view
+
+    def release(self, view: ViewerWebView):
+        """Take back the view of a closed tab, or delete it when the pool is full"""
+        # Drop the connections the tab and its window made
+        for signal in (view.web_page.link_clicked, view.customContextMenuRequested):
+            try:
+                signal.disconnect()
+            except TypeError:
+                pass
+        view.setParent(None)
+        if len(self._idle) >= self.POOL_SIZE:
+            view.deleteLater()
+            return
+        view.page().findText("")
+        view.setZoomFactor(1.0)
+        view.document_bridge.clear()
+        view.load_shell(self._shell_html, self._shell_base_url)
+        self._idle.append(view)
+
+
+class SearchWorker(QThread):
+    """Run a folder search off the GUI thread, streaming results in batches"""
+    results_ready = pyqtSignal(list)  # Batch of SearchResult
+    search_finished = pyqtSignal(object)  # RankedResults over all results
+    search_failed = pyqtSignal(str)
+
+    BATCH_INTERVAL = 0.1  # Seconds between batches after the first one
+
+    def __init__(self, search_engine: SearchEngine, folder_path: str, query: str,
+                 case_sensitive: bool, use_regex: bool, search_filenames: bool,
+                 operator: str, name_filters: Optional[List[str]],
+                 base_results: Optional[List[SearchResult]] = None):
+        super().__init__()
+        self.search_engine = search_engine
+        self.folder_path = folder_path
+        self.query = query
+        self.case_sensitive = case_sensitive
+        self.use_regex = use_regex
+        self.search_filenames = search_filenames
+        self.operator = operator
+        self.name_filters = name_filters
+        self.base_results = base_results  # Results of a broader query to narrow down
+        self.results = []  # Accumulated on the GUI thread as batches arrive
+        self._cancelled = False
+
+    def cancel(self):
+        """Ask the search to stop at the next file"""
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def run(self):
+        found = []
+        pending = []
+        index_builds = []  # Run after the results are reported
+        last_emit = 0.0  # Emit the first batch as soon as anything matches
+        try:
+            generation = self.search_engine.folder_generation(self.folder_path)
+            if self.base_results is not None:
+                batches = self.search_engine.iter_refine(
+                    self.base_results, self.query, self.case_sensitive, self.search_filenames,
+                    self.operator, is_cancelled=self.is_cancelled)
+            else:
+                batches = self.search_engine.iter_search(
+                    self.folder_path, self.query, self.case_sensitive, self.use_regex,
+                    self.search_filenames, self.operator, self.name_filters,
+                    is_cancelled=self.is_cancelled, index_later=index_builds.append)
+            # Batches come per file, empty ones included, so a match found
+            # just after an emit waits at most one interval plus one file
+            for batch in batches:
+                found.extend(batch)
+                pending.extend(batch)
+                now = time.monotonic()
+                if pending and now - last_emit >= self.BATCH_INTERVAL:
+                    self.results_ready.emit(pending)
+                    pending = []
+                    last_emit = now
+            if self._cancelled:
+                return
+            if pending:
+                self.results_ready.emit(pending)
+            ranking = self.search_engine.rank_results(
+                self.folder_path, found, self.query, self.case_sensitive,
+                self.use_regex, self.operator)
+            self.search_engine.cache_results(
+                self.folder_path, self.query, self.case_sensitive, self.use_regex,
+                self.search_filenames, self.operator, self.name_filters, generation, ranking)
+        except Exception as e:
+            self.search_failed.emit(str(e))
+            return
+        self.search_finished.emit(ranking)
+
+        # A folder searched for the first time is indexed here; closing the
+        # window cancels this like the search itself
+        for build in index_builds:
+            try:
+                build()
+            except Exception as e:
+                print(f"Error building search index: {e}")
+
+
+class CsvIndexWorker(QThread):
+    """Index the rows of a large CSV file off the GUI thread and cache the index"""
+    index_ready = pyqtSignal(object)  # CsvTable
+    index_failed = pyqtSignal(str)
+
+    def __init__(self, cache: CsvIndexCache, file_path: str):
+        super().__init__()
+        self.cache = cache
+        self.file_path = file_path
+        self.file_size = 0  # Size of the indexed file version
+        self._cancelled = False
+
+    def cancel(self):
+        """Ask the indexing to stop at the next chunk"""
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def run(self):
+        try:
+            st = os.stat(self.file_path)
+            self.file_size = st.st_size
+            table = CsvTable.from_file(self.file_path, self.is_cancelled)
+            if table is None:
+                return
+            self.cache.save(self.file_path, st.st_mtime_ns, st.st_size, table.offsets)
+        except Exception as e:
+            self.index_failed.emit(str(e))
+            return
+        self.index_ready.emit(table)
+
+
+class CsvViewWorker(QThread):
+    """Sort and filter a large CSV table off the GUI thread, building its columns first"""
+    view_ready = pyqtSignal(object, object)  # CsvColumns, row order (None for file order)
+    view_failed = pyqtSignal(str)
+
+    def __init__(self, table: CsvTable, view: CsvTableView):
+        super().__init__()
+        self.table = table
+        self.view = view  # A copy: the tab's view may change while this runs
+        self._cancelled = False
+
+    def cancel(self):
+        """Ask the build to stop at the next batch of rows"""
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def run(self):
+        try:
+            columns = self.table.columns or CsvColumns.from_table(self.table, self.is_cancelled)
+            if columns is None:
+                return
+            row_order = columns.row_order(self.view)
+        except Exception as e:
+            self.view_failed.emit(str(e))
+            return
+        if not self._cancelled:
+            self.view_ready.emit(columns, row_order)
+
 
-                # Allow anchor navigation within the same page
-                if url_str.startswith('#') or (url.hasFragment() and url.path() == ''):
-                    return True
+class XmlChildrenWorker(QThread):
+    """List the child elements of an XML outline node off the GUI thread"""
+    children_found = pyqtSignal(list)  # XmlNode list, shown while large children are still read
+    children_ready = pyqtSignal(list, object)  # Remaining XmlNode list, resume id (None once all are listed)
+    children_failed = pyqtSignal(str)
 
-                # Check if Shift is pressed for new tab
-                modifiers = QApplication.keyboardModifiers()
-                new_tab = bool(modifiers & Qt.KeyboardModifier.ShiftModifier)
+    def __init__(self, outline: XmlOutline, offset: int, line: int, resume: Optional[int] = None):
+        super().__init__()
+        self.outline = outline
+        self.offset = offset  # Start tag of the element whose children are listed
+        self.line = line
+        self.resume = resume
+        self._cancelled = False
 
-                # Defer signal emission to avoid crash during navigation request
-                QTimer.singleShot(0, lambda u=url_str, n=new_tab: self.link_clicked.emit(u, n))
-                return False  # Prevent default navigation
+    def cancel(self):
+        """Ask the listing to stop at the next chunk"""
+        self._cancelled = True
 
-            return True
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def run(self):
+        try:
+            result = self.outline.children(self.offset, self.line, self.resume, self.is_cancelled,
+                                           self.children_found.emit)
         except Exception as e:
-            print(f"Error in navigation request: {e}")
-            return False
+            self.children_failed.emit(str(e))
+            return
+        if result is not None:
+            self.children_ready.emit(*result)
 
 
 class SessionManager:
@@ -1111,7 +3770,10 @@ class FolderTab(QWidget):
         ("All files", None),
     ]
 
-    def __init__(self, parent=None):
+    LIVE_SEARCH_DELAY = 300     # Milliseconds after the last keystroke before searching
+    LIVE_SEARCH_MIN_CHARS = 2   # Shorter queries only search on Enter
+
+    def __init__(self, parent=None, web_view: Optional[ViewerWebView] = None):
         super().__init__(parent)
         self.current_folder = None
         self.current_file = None
@@ -1129,6 +3791,7 @@ class FolderTab(QWidget):
         self.parent_btn = None
         self.navigation_history = []  # Stack for back navigation
         self.tab_recent_files = []  # Per-tab recent files for history bar
+        self.restore_pending = False  # Restored from the session; folder and file load when first shown
         # Search panel components
         self.search_input = None
         self.search_button = None
@@ -1148,9 +3811,51 @@ class FolderTab(QWidget):
         self.current_search_query = ""
         self.current_search_results = []
         self.current_search_scope = 'all'
+        self.current_search_ranking = None  # RankedResults paging current_search_results
+        self.search_result_files = (None, set())  # (result list, its file paths), updated per streamed batch
+        self.search_worker = None  # SearchWorker streaming results into this tab
+        self.csv_worker = None  # CsvIndexWorker or CsvViewWorker for the CSV file shown
+        self.csv_table = None  # CsvTable shown, once indexed
+        self.csv_table_view = CsvTableView()
+        self.xml_worker = None  # XmlChildrenWorker for the XML outline shown
+        self.xml_requests = []  # (offset, line, resume id) listings waiting for the worker
+        self.xml_outline = None  # XmlOutline shown
+        self.current_view = None  # Kind of page shown in web view ('markdown', 'document', 'search', 'list')
+        self._pending_page_js = None  # Scripts queued while a page is loading
         self._highlight_line = 0
         self._highlight_keyword = ""
-        self._setup_ui()
+        self._restore_scroll_y = 0  # Scroll position for the next Markdown or code render
+        self._update_in_place = False  # Next Markdown render patches the shown document
+        self.live_search_timer = QTimer(self)  # Debounces search-as-you-type
+        self.live_search_timer.setSingleShot(True)
+        self.live_search_timer.setInterval(self.LIVE_SEARCH_DELAY)
+        self._setup_ui(web_view)
+
+    def set_html(self, html: str, base_url, view: str = 'document'):
+        """Load a page into the web view and remember what kind of page it is"""
+        self.current_view = view
+        self._pending_page_js = []
+        self.csv_table = None
+        self.xml_outline = None
+        self.web_view.setHtml(html, base_url)
+
+    def run_page_js(self, script: str):
+        """Run JavaScript on the current page, deferring it until the page has loaded"""
+        if self._pending_page_js is not None:
+            self._pending_page_js.append(script)
+        else:
+            self.web_view.page().runJavaScript(script)
+
+    def take_web_view(self) -> ViewerWebView:
+        """Detach the web view from this tab so it can be reused"""
+        self.web_view.loadFinished.disconnect(self._on_page_load_finished)
+        return self.web_view
+
+    def _on_page_load_finished(self, ok: bool):
+        """Flush scripts queued while the page was loading"""
+        pending, self._pending_page_js = self._pending_page_js, None
+        for script in pending or []:
+            self.web_view.page().runJavaScript(script)
 
     def add_recent_file(self, file_path: str):
         """Add file to per-tab recent files list (max 8)"""
@@ -1423,7 +4128,7 @@ class FolderTab(QWidget):
         except Exception as e:
             print(f"Failed to copy markdown link to clipboard: {e}")
 
-    def _setup_ui(self):
+    def _setup_ui(self, web_view: Optional[ViewerWebView] = None):
         """Setup splitter layout for this tab"""
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -1478,19 +4183,15 @@ class FolderTab(QWidget):
         left_panel.setMinimumWidth(180)
         left_panel.setMaximumWidth(300)
 
-        # Web view setup with custom page for link handling
-        self.web_view = QWebEngineView()
-        self.web_page = MarkdownWebPage(self.web_view)
-        self.web_view.setPage(self.web_page)
-        self.web_view.setMinimumWidth(600)
-
-        # Allow local content to access remote URLs (for CDN scripts)
-        self.web_view.settings().setAttribute(
-            QWebEngineSettings.WebAttribute.LocalContentCanAccessRemoteUrls, True
-        )
-
-        # Enable context menu for right-click
-        self.web_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        # Web view with custom page for link handling; a view from the
+        # WebViewPool already has the Markdown shell loaded (or loading)
+        self.web_view = web_view or ViewerWebView()
+        self.web_page = self.web_view.web_page
+        self.document_bridge = self.web_view.document_bridge
+        if self.web_view.has_shell:
+            self.current_view = 'markdown'
+            self._pending_page_js = [] if self.web_view.shell_loading else None
+        self.web_view.loadFinished.connect(self._on_page_load_finished)
 
         self.splitter.addWidget(left_panel)
         self.splitter.addWidget(self.web_view)
@@ -1525,6 +4226,22 @@ class FolderTab(QWidget):
         self.stats_labels["size"].setText(f"{size_kb:.1f} KB")
         self.stats_section.set_summary(f"{lines:,} lines")
 
+    def update_table_stats(self, row_count: Optional[int], size: int):
+        """Update stats panel for a table read through its row index (not as text)"""
+        rows = f"{row_count:,}" if row_count is not None else "…"
+        self.stats_labels["lines"].setText(rows)
+        for key in ['chars', 'words', 'time']:
+            self.stats_labels[key].setText("-")
+        self.stats_labels["size"].setText(f"{size / 1024:.1f} KB")
+        self.stats_section.set_summary(f"{rows} rows")
+
+    def update_size_stats(self, size: int):
+        """Update stats panel for a file shown without reading it as text"""
+        for key in ['lines', 'chars', 'words', 'time']:
+            self.stats_labels[key].setText("-")
+        self.stats_labels["size"].setText(f"{size / 1024:.1f} KB")
+        self.stats_section.set_summary(f"{size / (1024 * 1024):.1f} MB")
+
     def clear_file_info(self):
         """Clear file info panel, stats, and disable quick actions"""
         # Clear file info
@@ -1597,6 +4314,10 @@ class FolderTab(QWidget):
         """Handle filter dropdown change"""
         self._apply_filter(index)
 
+    def get_name_filters(self) -> Optional[List[str]]:
+        """Get name filter patterns of the current filter (None for all files)"""
+        return self.FILTER_OPTIONS[self.get_filter_index()][1]
+
     def get_filter_index(self) -> int:
         """Get current filter index"""
         return self.filter_combo.currentIndex()
@@ -1630,10 +4351,21 @@ class MarkdownViewer(QMainWindow):
         self.highlight_js_content = ""
         self.mermaid_js_path = ""
         self.html_template = ""
+        self.markdown_shell_html = ""  # html_template with styles and scripts inlined
         self.list_view_template = ""
+        self.csv_view_template = ""
+        self.code_view_template = ""
+        self.xml_outline_template = ""
         self.tab_widget = None
         self.session_manager = SessionManager()
         self.search_engine = SearchEngine()
+        self.csv_index_cache = CsvIndexCache()
+        self.highlight_cache = HighlightCache()
+        self.markdown_renderer = MarkdownRenderer()
+        self._source_maps = OrderedDict()  # (file path, content digest) -> MarkdownSourceMap
+        self._search_workers = set()  # Running SearchWorker threads
+        self._csv_workers = set()  # Running CsvIndexWorker and CsvViewWorker threads
+        self._xml_workers = set()  # Running XmlChildrenWorker threads
         self.bookmark_manager = BookmarkManager()
         self._pending_load_finished_handler = None  # Track current loadFinished handler
 
@@ -1647,6 +4379,7 @@ class MarkdownViewer(QMainWindow):
         self._reload_timer.timeout.connect(self._process_pending_reloads)
 
         self._load_resources()
+        self.web_view_pool = WebViewPool(self.markdown_shell_html, self)
         self._setup_ui()
         self._setup_toolbar()
         self._setup_shortcuts()
@@ -1660,6 +4393,9 @@ class MarkdownViewer(QMainWindow):
         # Initialize history bar with existing recent files
         self._update_history_bar()
 
+        # Warm up web views for new tabs once startup work is done
+        QTimer.singleShot(WebViewPool.REFILL_DELAY, self.web_view_pool.fill)
+
     def _load_resources(self):
         """Load CSS, JavaScript paths, and HTML template"""
         # Load CSS
@@ -1685,17 +4421,42 @@ class MarkdownViewer(QMainWindow):
             self.highlight_js_content = highlight_js_path.read_text(encoding="utf-8")
         else:
             self.highlight_js_content = ""
+        # Highlighted code cached by an older highlight.js is not reused
+        match = re.search(r'Highlight\.js v(\S+)', self.highlight_js_content[:512])
+        self.highlight_cache.highlighter_version = match.group(1) if match else ''
 
         # Load HTML template
         template_path = get_resource_path("templates/markdown.html")
         if template_path.exists():
             self.html_template = template_path.read_text(encoding="utf-8")
 
+        # Markdown documents are rendered into this page, loaded once per tab
+        html = self.html_template
+        html = html.replace('$CSS_CONTENT$', self.css_content)
+        html = html.replace('$MARKED_JS_CONTENT$', self.marked_js_content)
+        html = html.replace('$MERMAID_JS_PATH$', self.mermaid_js_path)
+        self.markdown_shell_html = html
+
         # Load list view template
         list_view_template_path = get_resource_path("templates/list_view.html")
         if list_view_template_path.exists():
             self.list_view_template = list_view_template_path.read_text(encoding="utf-8")
 
+        # Load CSV table template
+        csv_view_template_path = get_resource_path("templates/csv_view.html")
+        if csv_view_template_path.exists():
+            self.csv_view_template = csv_view_template_path.read_text(encoding="utf-8")
+
+        # Load source code template
+        code_view_template_path = get_resource_path("templates/code_view.html")
+        if code_view_template_path.exists():
+            self.code_view_template = code_view_template_path.read_text(encoding="utf-8")
+
+        # Load XML outline template
+        xml_outline_template_path = get_resource_path("templates/xml_outline.html")
+        if xml_outline_template_path.exists():
+            self.xml_outline_template = xml_outline_template_path.read_text(encoding="utf-8")
+
     def _setup_ui(self):
         """Setup main UI with tab widget"""
         self.tab_widget = QTabWidget()
@@ -1851,10 +4612,21 @@ class MarkdownViewer(QMainWindow):
             self._clear_find_in_page(tab)
 
     def _on_search_text_changed(self, tab: FolderTab, text: str):
-        """Clear find-in-page when search input is emptied"""
-        if not text.strip() and tab.find_in_page_active:
+        """Clear find-in-page when search input is emptied, and schedule live folder search"""
+        query = text.strip()
+        if not query and tab.find_in_page_active:
             self._clear_find_in_page(tab)
 
+        # "This file" scope keeps searching on Enter (find-in-page advances per Enter)
+        search_current_file = (tab.scope_current_btn.isChecked()
+                               and tab.scope_current_btn.isEnabled())
+        if (len(query) >= FolderTab.LIVE_SEARCH_MIN_CHARS and tab.current_folder
+                and not search_current_file
+                and not (query == tab.current_search_query and tab.current_view == 'search')):
+            tab.live_search_timer.start()
+        else:
+            tab.live_search_timer.stop()
+
     def _update_scope_toggle_state(self, tab: FolderTab):
         """Update scope toggle button enabled state based on current file"""
         if tab.current_file:
@@ -1950,13 +4722,27 @@ class MarkdownViewer(QMainWindow):
         tab = self._add_new_tab()
         self._render_markdown(tab, "# Welcome to Markdown Viewer\n\nOpen a folder to get started.\n\n## Keyboard Shortcuts\n\n| Shortcut | Action |\n|----------|--------|\n| Ctrl+O | Open Folder |\n| Ctrl+W | Close Tab |\n| Ctrl+Tab | Next Tab |\n| Ctrl+Shift+Tab | Previous Tab |\n| Ctrl+F | Search |\n| Ctrl+B | Bookmark |\n| Ctrl+H | Recent Files |\n| Ctrl+Shift+L | Toggle Sidebar |\n| Ctrl+Shift+O | Toggle Outline |\n| Ctrl+Shift+I | Toggle Stats |\n| Ctrl++ | Zoom In |\n| Ctrl+- | Zoom Out |\n| Ctrl+0 | Zoom Reset |\n| F5 | Refresh |\n| F1 | Help |\n| ESC | Go Back |")
 
-    def _add_new_tab(self, folder_path: str = None) -> FolderTab:
-        """Create and add a new folder tab"""
-        tab = FolderTab(self)
+    def _add_new_tab(self, folder_path: str = None, restored: bool = False) -> FolderTab:
+        """Create and add a new folder tab
+
+        Restored tabs are placeholders: they stay in the background and
+        populate their folder on first activation (see _activate_restored_tab).
+        """
+        # Placeholders get a bare view, which starts no renderer until it loads a page
+        tab = FolderTab(self, None if restored else self.web_view_pool.acquire())
         tab.tree_view.clicked.connect(
             lambda idx, t=tab: self._on_file_clicked(t, idx)
         )
 
+        # Files renamed or removed in the tree make cached searches stale
+        tab.file_model.fileRenamed.connect(
+            lambda path, old_name, new_name: self.search_engine.invalidate(path)
+        )
+        tab.file_model.rowsRemoved.connect(
+            lambda parent, first, last, t=tab: self.search_engine.invalidate(
+                t.file_model.filePath(parent))
+        )
+
         # Connect link click signal
         tab.web_page.link_clicked.connect(
             lambda url, new_tab, t=tab: self._on_link_clicked(t, url, new_tab)
@@ -1979,6 +4765,7 @@ class MarkdownViewer(QMainWindow):
         tab.search_button.clicked.connect(lambda checked, t=tab: self._perform_search(t))
         tab.search_input.returnPressed.connect(lambda t=tab: self._perform_search(t))
         tab.search_input.textChanged.connect(lambda text, t=tab: self._on_search_text_changed(t, text))
+        tab.live_search_timer.timeout.connect(lambda t=tab: self._perform_search(t, live=True))
         tab.recent_btn.clicked.connect(lambda checked, t=tab: self._show_recent_files(t))
         tab.bookmark_btn.clicked.connect(lambda checked, t=tab: self._show_bookmarks(t))
 
@@ -1989,6 +4776,12 @@ class MarkdownViewer(QMainWindow):
         tab.find_prev_btn.clicked.connect(lambda checked, t=tab: self._find_in_page_prev(t))
         tab.find_next_btn.clicked.connect(lambda checked, t=tab: self._find_in_page_next(t))
 
+        if restored:
+            tab.current_folder = folder_path
+            tab.restore_pending = True
+            self.tab_widget.addTab(tab, tab.get_tab_name())
+            return tab
+
         if folder_path:
             tab.set_folder(folder_path)
             self.tab_widget.addTab(tab, tab.get_tab_name())
@@ -2016,9 +4809,19 @@ class MarkdownViewer(QMainWindow):
 
     def _close_tab(self, index: int):
         """Close tab at given index"""
+        self._cancel_search(self.tab_widget.widget(index))
+        self._cancel_csv_worker(self.tab_widget.widget(index))
+        self._cancel_xml_worker(self.tab_widget.widget(index))
         if self.tab_widget.count() > 1:
             widget = self.tab_widget.widget(index)
             self.tab_widget.removeTab(index)
+            if self._pending_load_finished_handler:
+                try:
+                    widget.web_view.loadFinished.disconnect(self._pending_load_finished_handler)
+                    self._pending_load_finished_handler = None
+                except TypeError:
+                    pass  # Belongs to another tab
+            self.web_view_pool.release(widget.take_web_view())
             widget.deleteLater()
         else:
             # Last tab - just reset it
@@ -2177,6 +4980,30 @@ class MarkdownViewer(QMainWindow):
         """Handle tab change"""
         self._update_window_title()
         self._update_history_bar()
+        tab = self.tab_widget.widget(index)
+        if tab and tab.restore_pending:
+            # Deferred so that tabs passed over while restoring stay unloaded
+            QTimer.singleShot(0, lambda t=tab: self._activate_restored_tab(t))
+
+    def _activate_restored_tab(self, tab: FolderTab):
+        """Populate a restored tab's folder and load its file on first activation"""
+        if not tab.restore_pending or tab is not self._get_current_tab():
+            return
+        tab.restore_pending = False
+        tab.set_folder(tab.current_folder)
+        file_path = tab.current_file
+        if not file_path:
+            return
+        self._update_scope_toggle_state(tab)
+        self._load_file(tab, file_path)
+
+        # Select the file once QFileSystemModel has populated
+        def select_file():
+            file_index = tab.file_model.index(file_path)
+            if file_index.isValid():
+                tab.tree_view.setCurrentIndex(file_index)
+                tab.tree_view.scrollTo(file_index)
+        QTimer.singleShot(200, select_file)
 
     def _navigate_to_parent(self, tab: FolderTab):
         """Navigate to parent directory of current folder"""
@@ -2231,129 +5058,8 @@ class MarkdownViewer(QMainWindow):
 
     def _render_markdown(self, tab: FolderTab, markdown_content: str):
         """Render markdown content in web view"""
-        # Build line info for gutter (detect all significant lines)
-        # Each entry must correspond 1:1 with a rendered DOM element.
-        # Consecutive text lines are merged into one <p> by marked.js,
-        # so we must emit only one 'p' entry per paragraph block.
-        import json
         lines = markdown_content.split('\n')
-        line_info = []
-        in_code_block = False
-        in_table = False
-        in_paragraph = False
-
-        def _is_hr(s):
-            """Check if line is a horizontal rule (3+ of same char: -, *, _)"""
-            no_space = s.replace(' ', '')
-            return (len(no_space) >= 3
-                    and no_space[0] in '-*_'
-                    and all(c == no_space[0] for c in no_space))
-
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-
-            # Track code blocks
-            if stripped.startswith('```'):
-                in_code_block = not in_code_block
-                in_paragraph = False
-                line_info.append({'line': i, 'type': 'code_fence'})
-                continue
-
-            if in_code_block:
-                # Each line in code block
-                line_info.append({'line': i, 'type': 'code_line'})
-                continue
-
-            # Empty line resets paragraph/table state
-            if not stripped:
-                in_paragraph = False
-                in_table = False
-                continue
-
-            # Horizontal rule (check before list items to handle '* * *')
-            if _is_hr(stripped) and not in_table:
-                line_info.append({'line': i, 'type': 'hr'})
-                in_paragraph = False
-                in_table = False
-            # Headings
-            elif stripped.startswith('#'):
-                level = len(stripped) - len(stripped.lstrip('#'))
-                if 1 <= level <= 6:
-                    line_info.append({'line': i, 'type': f'h{level}'})
-                    in_paragraph = False
-                    in_table = False
-            # Unordered list item
-            elif stripped.startswith(('- ', '* ', '+ ')) or stripped in ('- ', '* ', '+ ', '-', '*', '+'):
-                line_info.append({'line': i, 'type': 'li'})
-                in_paragraph = False
-                in_table = False
-            # Ordered list item
-            elif stripped and stripped[0].isdigit() and '. ' in stripped[:4]:
-                line_info.append({'line': i, 'type': 'li'})
-                in_paragraph = False
-                in_table = False
-            # Blockquote line
-            elif stripped.startswith('>'):
-                line_info.append({'line': i, 'type': 'quote'})
-                in_paragraph = False
-                in_table = False
-            # Table row
-            elif stripped.startswith('|') and stripped.endswith('|'):
-                # Table separator row - skip (don't create entry)
-                sep_test = stripped.replace(' ', '').replace('-', '').replace('|', '').replace(':', '')
-                if sep_test == '':
-                    in_table = True
-                else:
-                    line_info.append({'line': i, 'type': 'tr'})
-                    in_table = True
-                in_paragraph = False
-            # Paragraph: only emit one entry per paragraph block
-            else:
-                if not in_paragraph:
-                    line_info.append({'line': i, 'type': 'p'})
-                    in_paragraph = True
-                in_table = False
-
-        line_info_json = json.dumps(line_info)
-
-        # Escape special characters for JavaScript template literal
-        escaped_content = markdown_content.replace('\\', '\\\\')
-        escaped_content = escaped_content.replace('`', '\\`')
-        escaped_content = escaped_content.replace('$', '\\$')
-        # Prevent </script> in content from closing the HTML script element
-        escaped_content = escaped_content.replace('</', '<\\/')
-
-        # Raw source lines for clipboard copy (JSON-encoded)
-        raw_lines_json = json.dumps(markdown_content.split('\n'), ensure_ascii=False)
-        # Prevent </script> in JSON from closing the HTML script element
-        raw_lines_json = raw_lines_json.replace('</', '<\\/')
-
-        # File path for clipboard copy
-        file_path = (tab.current_file or '').replace('\\', '\\\\')
-
-        # Back button visibility
-        back_button_style = "display: flex;" if tab.navigation_history else "display: none;"
-
-        # Build HTML from template
-        html = self.html_template
-        html = html.replace('$CSS_CONTENT$', self.css_content)
-        html = html.replace('$MARKED_JS_CONTENT$', self.marked_js_content)
-        html = html.replace('$MERMAID_JS_PATH$', self.mermaid_js_path)
-        html = html.replace('$MARKDOWN_CONTENT$', escaped_content)
-        html = html.replace('$LINE_INFO$', line_info_json)
-        html = html.replace('$RAW_LINES$', raw_lines_json)
-        html = html.replace('$FILE_PATH$', file_path)
-        html = html.replace('$BACK_BUTTON_STYLE$', back_button_style)
-
-        # Add search highlighting placeholders
-        target_line = getattr(tab, '_highlight_line', 0)
-        search_keyword = getattr(tab, '_highlight_keyword', '')
-        html = html.replace('$TARGET_LINE$', str(target_line))
-        html = html.replace('$SEARCH_KEYWORD$', self._escape_for_js(search_keyword))
-
-        # Clear highlight info after rendering
-        tab._highlight_line = 0
-        tab._highlight_keyword = ""
+        source_map = self._markdown_source_map(tab.current_file, markdown_content, lines)
 
         # Set base URL for relative links to work correctly
         if tab.current_file:
@@ -2362,14 +5068,78 @@ class MarkdownViewer(QMainWindow):
             base_url = QUrl.fromLocalFile(tab.current_folder + '/')
         else:
             base_url = QUrl()
-        tab.web_view.setHtml(html, base_url)
+
+        # HTML cached by the Python renderer (when installed) skips parsing;
+        # otherwise the page parses the source with marked.js, block by block
+        # when it splits cleanly so a reload only re-parses changed blocks.
+        # Very large documents are always sent as blocks, which the page
+        # renders windowed.
+        virtual = len(markdown_content) > MD_VIRTUAL_THRESHOLD
+        html = None if virtual else self.markdown_renderer.cached_html(tab.current_file, markdown_content)
+        blocks = None
+        if html is None:
+            if not virtual:
+                self.markdown_renderer.cache_in_background(tab.current_file, markdown_content)
+            blocks = split_markdown_blocks(lines)
+
+        document = {
+            'markdown': markdown_content if html is None and blocks is None else '',
+            'html': html,
+            'blocks': blocks,
+            'hasDiagrams': source_map.has_diagrams,
+            'virtual': virtual and blocks is not None,
+            'update': tab._update_in_place and tab.current_view == 'markdown',
+            'filePath': tab.current_file or '',
+            'baseUrl': base_url.toString(),
+            'showBack': bool(tab.navigation_history),
+            'targetLine': getattr(tab, '_highlight_line', 0),
+            'searchKeyword': getattr(tab, '_highlight_keyword', ''),
+            'scrollY': getattr(tab, '_restore_scroll_y', 0),
+        }
+
+        # Clear highlight info after rendering
+        tab._highlight_line = 0
+        tab._highlight_keyword = ""
+        tab._restore_scroll_y = 0
+
+        # Switching between Markdown files updates the already loaded page;
+        # the page itself is only loaded when the tab showed something else
+        serial = tab.document_bridge.set_document(document, source_map, lines)
+        if tab.current_view != 'markdown':
+            tab.set_html(self.markdown_shell_html, base_url, 'markdown')
+        tab.run_page_js(f"loadDocument({serial});")
+
+    def _markdown_source_map(self, file_path: str, text: str, lines: List[str]) -> MarkdownSourceMap:
+        """Gutter source map of a file version (scanned once, then cached)"""
+        key = (file_path, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest())
+        source_map = self._source_maps.get(key)
+        if source_map is None:
+            source_map = scan_markdown_blocks(lines)
+            self._source_maps[key] = source_map
+            while len(self._source_maps) > SOURCE_MAP_CACHE_SIZE:
+                self._source_maps.popitem(last=False)
+        self._source_maps.move_to_end(key)
+        return source_map
 
     def _load_file(self, tab: FolderTab, file_path: str):
         """Load and render file based on type"""
         self._clear_find_in_page(tab)
         self._update_file_watch()
+        self._cancel_csv_worker(tab)
+        self._cancel_xml_worker(tab)
         file_type = detect_file_type(file_path)
         try:
+            if file_type == FileType.CSV and os.path.getsize(file_path) > CSV_BACKGROUND_INDEX_SIZE:
+                # Large tables are only read through their row index, never as a whole
+                self._render_csv(tab, file_path)
+                tab.update_file_info()
+                return
+            if file_type == FileType.XML and os.path.getsize(file_path) > XML_OUTLINE_SIZE:
+                # Large documents are read an element level at a time, never as a whole
+                self._render_xml_outline(tab, file_path)
+                tab.update_file_info()
+                return
+
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
 
@@ -2380,7 +5150,7 @@ class MarkdownViewer(QMainWindow):
             elif file_type == FileType.PYTHON:
                 self._render_code(tab, content, 'python', 'Python Script')
             elif file_type == FileType.CSV:
-                self._render_csv(tab, content)
+                self._render_csv(tab, file_path)
             elif file_type == FileType.CDXML:
                 self._render_cdxml(tab, content)
             else:
@@ -2403,8 +5173,13 @@ class MarkdownViewer(QMainWindow):
             tab._highlight_line = 0
             tab._highlight_keyword = ""
 
-    def _perform_search(self, tab: FolderTab):
-        """Execute search and display results"""
+    def _perform_search(self, tab: FolderTab, live: bool = False):
+        """Execute search and display results
+
+        Live searches (typed, not submitted) are not added to search history,
+        and update an already showing results page without a navigation step.
+        """
+        tab.live_search_timer.stop()
         query = tab.search_input.text().strip()
         if not query:
             if tab.find_in_page_active:
@@ -2445,47 +5220,145 @@ class MarkdownViewer(QMainWindow):
         search_filenames = tab.filename_check.isChecked()
         operator = 'AND'  # Default operator
 
-        # Disable search button while searching
-        tab.search_button.setEnabled(False)
-        tab.search_button.setText("⏳")
-
-        try:
-            # Perform search
-            results = self.search_engine.search(
-                tab.current_folder,
-                tab.file_model,
-                query,
-                case_sensitive,
-                use_regex,
-                search_filenames,
-                operator
-            )
-
-            # Store results
-            tab.current_search_query = query
-            tab.current_search_results = results
-            tab.current_search_scope = 'all'
+        name_filters = tab.get_name_filters()
+
+        # A new query supersedes any search still running in this tab
+        self._cancel_search(tab)
+
+        # A repeat search of an unchanged folder is served from memory
+        ranking = self.search_engine.cached_search(tab.current_folder, query, case_sensitive,
+                                                   use_regex, search_filenames, operator,
+                                                   name_filters)
+        worker = None
+        if ranking is None:
+            # Extending a cached query narrows its results instead of rescanning the folder
+            base_results = self.search_engine.refinable_search(
+                tab.current_folder, query, case_sensitive, use_regex, search_filenames,
+                operator, name_filters)
+            worker = SearchWorker(self.search_engine, tab.current_folder, query, case_sensitive,
+                                  use_regex, search_filenames, operator, name_filters,
+                                  base_results)
+
+        # Typing (or submitting what was typed) updates the results page in place
+        replace_page = tab.current_view == 'search' and (live or query == tab.current_search_query)
+
+        # Store results
+        tab.current_search_query = query
+        tab.current_search_results = ranking.results if ranking else worker.results
+        tab.current_search_scope = 'all'
+        tab.current_search_ranking = ranking  # Ranked once a new search completes
+        tab.search_worker = worker
 
-            # Add to search history
+        # Add to search history
+        if not live:
             self.session_manager.add_search_history(
                 query, case_sensitive, use_regex, search_filenames, operator, 'all'
             )
 
-            # Save current state to navigation history
+        # Save current state to navigation history
+        if not replace_page:
             if tab.current_file:
                 tab.navigation_history.append(('file', tab.current_file))
             elif tab.current_folder:
                 tab.navigation_history.append(('folder', tab.current_folder))
 
-            # Render results
-            self._render_search_results(tab, results, query, 'all')
+        if worker is None:
+            self._render_search_results(tab, tab.current_search_results, query, 'all')
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Search Error", f"Failed to search:\n{e}")
-        finally:
-            # Re-enable search button
-            tab.search_button.setEnabled(True)
-            tab.search_button.setText("🔍")
+        # Show the results page right away; matches are appended as they stream in
+        tab.search_button.setText("⏳")
+        self._render_search_results(tab, worker.results, query, 'all')
+
+        worker.results_ready.connect(
+            lambda batch, t=tab, w=worker: self._on_search_batch(t, w, batch))
+        worker.search_finished.connect(
+            lambda ranking, t=tab, w=worker: self._on_search_finished(t, w, ranking))
+        worker.search_failed.connect(
+            lambda error, t=tab, w=worker: self._on_search_failed(t, w, error))
+        worker.finished.connect(lambda w=worker: self._release_search_worker(w))
+        self._search_workers.add(worker)
+        worker.start()
+
+    def _cancel_search(self, tab: FolderTab):
+        """Stop the search running in a tab, if any"""
+        worker = tab.search_worker
+        if worker is None:
+            return
+        worker.cancel()
+        tab.search_worker = None
+        tab.search_button.setText("🔍")
+
+    def _release_search_worker(self, worker: SearchWorker):
+        """Drop our reference to a worker once its thread has exited"""
+        worker.wait()
+        self._search_workers.discard(worker)
+
+    def _is_showing_search(self, tab: FolderTab, results: List[SearchResult]) -> bool:
+        """Check whether the web view currently shows this result list"""
+        return tab.current_view == 'search' and tab.current_search_results is results
+
+    def _on_search_batch(self, tab: FolderTab, worker: SearchWorker, batch: List[SearchResult]):
+        """Append a streamed batch of results to the results page"""
+        if tab.search_worker is not worker:
+            return  # Superseded by a newer search or cancelled
+        # Until results are ranked, only the first page is shown (in file order)
+        visible = batch[:max(0, RankedResults.PAGE_SIZE - len(worker.results))]
+        worker.results.extend(batch)
+        counted, files = tab.search_result_files
+        if counted is worker.results:
+            files.update(r.file_path for r in batch)
+        if self._is_showing_search(tab, worker.results):
+            items_html = self._generate_list_items_html(visible, 'search', worker.query) if visible else ''
+            stats = self._search_stats_text(tab, worker.results, 'all', searching=True)
+            tab.run_page_js(f"appendResults({json.dumps(items_html)}, {json.dumps(stats)});")
+
+    def _on_search_finished(self, tab: FolderTab, worker: SearchWorker, ranking: RankedResults):
+        """Replace the streamed results with the best ranked page when the search completes"""
+        if tab.search_worker is not worker:
+            return
+        tab.search_worker = None
+        tab.search_button.setText("🔍")
+        ranking.results = worker.results  # Same results, in the same order
+        if tab.current_search_results is worker.results:
+            tab.current_search_ranking = ranking
+        for i, state in enumerate(tab.navigation_history):
+            # Results left mid-stream for a file view are ranked too
+            if isinstance(state, tuple) and state[0] == 'search' and state[2] is worker.results:
+                tab.navigation_history[i] = state[:4] + (ranking,)
+        if self._is_showing_search(tab, worker.results):
+            page = ranking.next_page()
+            items_html = self._generate_list_items_html(page, 'search', worker.query)
+            stats = self._search_stats_text(tab, worker.results, 'all')
+            more = self._more_results_label(ranking)
+            tab.run_page_js(f"finishResults({json.dumps(stats)}, {json.dumps(items_html)}, "
+                            f"{json.dumps(more)});")
+
+    def _show_more_results(self, tab: FolderTab):
+        """Append the next page of ranked results"""
+        ranking = tab.current_search_ranking
+        if ranking is None or not self._is_showing_search(tab, tab.current_search_results):
+            return
+        page = ranking.next_page()
+        if page:
+            items_html = self._generate_list_items_html(page, 'search', tab.current_search_query)
+            stats = self._search_stats_text(tab, tab.current_search_results, tab.current_search_scope)
+            tab.run_page_js(f"appendResults({json.dumps(items_html)}, {json.dumps(stats)});")
+        tab.run_page_js(f"setMoreResults({json.dumps(self._more_results_label(ranking))});")
+
+    def _more_results_label(self, ranking: RankedResults) -> str:
+        """Label for the "show more" link, or '' when every result is shown"""
+        if not ranking.remaining:
+            return ''
+        return f"Show more results ({ranking.remaining} remaining)"
+
+    def _on_search_failed(self, tab: FolderTab, worker: SearchWorker, error: str):
+        """Report a search that raised on the worker thread"""
+        if tab.search_worker is not worker:
+            return
+        tab.search_worker = None
+        tab.search_button.setText("🔍")
+        QMessageBox.critical(self, "Search Error", f"Failed to search:\n{error}")
 
     def _find_in_page(self, tab: FolderTab, query: str, case_sensitive: bool):
         """Execute find-in-page using QWebEnginePage.findText()"""
@@ -2567,17 +5440,28 @@ class MarkdownViewer(QMainWindow):
         # Clear file info when showing search results
         tab.clear_file_info()
 
+        # Results still streaming in from a worker are appended after load
+        searching = tab.search_worker is not None and tab.search_worker.results is results
+
         # Generate statistics
-        total_matches = len(results)
-        if scope == 'current' and tab.current_file:
-            filename = os.path.basename(tab.current_file)
-            stats = f'{total_matches} match{"es" if total_matches != 1 else ""} in "{filename}"'
+        stats = self._search_stats_text(tab, results, scope, searching)
+
+        # Render only the first page; the rest is paged in on demand
+        more = ''
+        if searching:
+            page = results[:RankedResults.PAGE_SIZE]
         else:
-            total_files = len(set(r.file_path for r in results))
-            stats = f"{total_matches} match{'es' if total_matches != 1 else ''} in {total_files} file{'s' if total_files != 1 else ''}"
+            if tab.current_search_ranking is None or tab.current_search_ranking.results is not results:
+                tab.current_search_ranking = RankedResults(results)
+            tab.current_search_ranking.rewind()
+            page = tab.current_search_ranking.next_page()
+            more = self._more_results_label(tab.current_search_ranking)
 
         # Generate list items HTML
-        list_items_html = self._generate_list_items_html(results, 'search', query)
+        if searching and not page:
+            list_items_html = ''
+        else:
+            list_items_html = self._generate_list_items_html(page, 'search', query)
 
         # Replace placeholders
         html = self.list_view_template
@@ -2593,9 +5477,33 @@ class MarkdownViewer(QMainWindow):
             base_url = QUrl.fromLocalFile(tab.current_folder + '/')
         else:
             base_url = QUrl()
-        tab.web_view.setHtml(html, base_url)
+        tab.set_html(html, base_url, 'search')
+        if more:
+            tab.run_page_js(f"setMoreResults({json.dumps(more)});")
         self._update_window_title()
 
+    def _search_stats_text(self, tab: FolderTab, results: List[SearchResult],
+                           scope: str, searching: bool = False) -> str:
+        """Format the match summary shown above search results"""
+        total_matches = len(results)
+        if scope == 'current' and tab.current_file:
+            filename = os.path.basename(tab.current_file)
+            stats = f'{total_matches} match{"es" if total_matches != 1 else ""} in "{filename}"'
+        else:
+            total_files = self._count_result_files(tab, results)
+            stats = f"{total_matches} match{'es' if total_matches != 1 else ''} in {total_files} file{'s' if total_files != 1 else ''}"
+        if searching:
+            stats += " (searching...)"
+        return stats
+
+    def _count_result_files(self, tab: FolderTab, results: List[SearchResult]) -> int:
+        """Number of files among results, counted once per result list"""
+        counted, files = tab.search_result_files
+        if counted is not results:
+            files = {r.file_path for r in results}
+            tab.search_result_files = (results, files)
+        return len(files)
+
     def _generate_list_items_html(self, items, list_type: str, keyword: str = "") -> str:
         """Generate HTML for list items (search results, recent files, or bookmarks)"""
         if not items:
@@ -2737,58 +5645,57 @@ class MarkdownViewer(QMainWindow):
             base_url = QUrl.fromLocalFile(tab.current_folder + '/')
         else:
             base_url = QUrl()
-        tab.web_view.setHtml(html, base_url)
+        tab.set_html(html, base_url)
 
     def _render_code(self, tab: FolderTab, content: str, language: str, title: str):
-        """Render code with syntax highlighting"""
-        escaped = self._escape_for_js(content)
-        html = f'''<!DOCTYPE html>
-<html><head>
-    <meta charset="UTF-8">
-    <style>{self.css_content}</style>
-    <style>{self.highlight_css}</style>
-    <script>{self.highlight_js_content}</script>
-    <style>
-        body {{ margin: 0; padding: 20px; background: var(--bg-color, #f8faff); }}
-        .file-header {{
-            background: var(--h2-bg, linear-gradient(135deg, #1976d2 0%, #1565c0 100%));
-            color: white; padding: 12px 20px;
-            border-radius: 6px 6px 0 0; font-weight: 600;
-            display: flex; align-items: center; gap: 8px;
-        }}
-        .file-badge {{
-            background: rgba(255,255,255,0.2); padding: 2px 8px;
-            border-radius: 4px; font-size: 11px; text-transform: uppercase;
-        }}
-        pre {{
-            margin: 0; border-top-left-radius: 0; border-top-right-radius: 0;
-            border-bottom-left-radius: 6px; border-bottom-right-radius: 6px;
-            overflow: auto;
-        }}
-        .hljs {{
-            background: var(--code-bg, #e3f2fd); padding: 16px;
-            font-family: 'Consolas', 'Monaco', monospace; font-size: 13px;
-            line-height: 1.5;
-        }}
-    </style>
-</head><body>
-    <div class="file-header">
-        <span class="file-badge">{language.upper()}</span>
-        <span>{title}</span>
-    </div>
-    <pre><code class="language-{language}" id="code-content"></code></pre>
-    <script>
-        document.getElementById('code-content').textContent = `{escaped}`;
-        hljs.highlightAll();
-    </script>
-</body></html>'''
+        """Render code with syntax highlighting
+
+        The page fetches the source over the document bridge, so a large
+        file never goes through setHtml, shows it as plain text at once and
+        highlights it in chunks, those in view first and the rest while idle.
+        Chunks are cached per file version, so a file seen before skips
+        highlight.js and the page only fetches its cached chunks.
+        """
+        chunks = None
+        store = None
+        entry = self.highlight_cache.entry(tab.current_file, content, language) if language != 'plaintext' else None
+        if entry is not None:
+            chunks = self.highlight_cache.load(entry)
+            # Also replaces cached chunks the page finds do not fit
+            store = lambda chunks, e=entry: self.highlight_cache.save_in_background(e, chunks)
+        serial = tab.web_view.document_bridge.set_code(content, chunks, store, self.highlight_js_content)
+        # The page scrolls once its source has arrived, not on load
+        scroll_y = tab._restore_scroll_y
+        tab._restore_scroll_y = 0
+
+        html = self.code_view_template
+        html = html.replace('$LANGUAGE$', language)
+        html = html.replace('$TITLE$', title)
+        html = html.replace('$CODE_SERIAL$', str(serial))
+        html = html.replace('$CACHED$', 'true' if chunks else 'false')
+        html = html.replace('$SCROLL_Y$', str(int(scroll_y)))
+        html = html.replace('$CSS_CONTENT$', self.css_content)
+        html = html.replace('$HIGHLIGHT_CSS$', self.highlight_css)
+        html = html.replace('$HIGHLIGHT_JS_CONTENT$', '' if chunks else self.highlight_js_content)
         self._set_html_with_base(tab, html)
 
-    def _render_csv(self, tab: FolderTab, content: str):
-        """Render CSV as HTML table"""
-        rows = list(csv.reader(StringIO(content)))
+    def _render_csv(self, tab: FolderTab, file_path: str):
+        """Render CSV as a table whose rows the page pulls as it scrolls
 
-        if not rows:
+        Large files use their cached row index, or show the header while a
+        worker indexes the rows and the rows follow once it is done.
+        """
+        self._cancel_csv_worker(tab)
+        if not tab._update_in_place:
+            tab.csv_table_view = CsvTableView()  # Reloads keep the sort and filter
+        size = os.path.getsize(file_path)
+        if size <= CSV_BACKGROUND_INDEX_SIZE:
+            table = CsvTable.from_file(file_path)
+        else:
+            table = self.csv_index_cache.load(file_path)
+            tab.update_table_stats(table.row_count if table else None, size)
+
+        if table is not None and not table.row_count:
             html = f'''<!DOCTYPE html>
 <html><head>
     <meta charset="UTF-8">
@@ -2801,66 +5708,318 @@ class MarkdownViewer(QMainWindow):
     <p style="color: var(--blockquote-color, #546e7a);">This CSV file contains no data.</p>
 </body></html>'''
         else:
-            # Build header row
-            header = ''.join(f'<th>{self._escape_html(c)}</th>' for c in rows[0])
-            # Build data rows
-            body = ''.join(
-                '<tr>' + ''.join(f'<td>{self._escape_html(c)}</td>' for c in row) + '</tr>'
-                for row in rows[1:]
-            )
-            row_count = len(rows)
-            col_count = len(rows[0]) if rows else 0
+            if table is not None:
+                header_cells = table.header
+                data_row_count = table.row_count - 1
+                stats = self._csv_stats_text(table)
+            else:
+                header_cells = read_csv_header(file_path)
+                data_row_count = 0  # Rows are shown once the worker has indexed them
+                stats = f'{len(header_cells)} columns, indexing rows…'
+            names = [self._escape_html(c).replace('$', '&#36;') for c in header_cells]
+            header = ''.join(
+                f'<th><a class="csv-sort" href="app://csv-sort?column={i}">{name}</a>'
+                f'<a class="csv-column-stats" href="app://csv-stats?column={i}" title="Column statistics">Σ</a></th>'
+                for i, name in enumerate(names))
+            column_options = ''.join(
+                f'<option value="{i}">{name}</option>' for i, name in enumerate(names))
+
+            html = self.csv_view_template
+            html = html.replace('$CSS_CONTENT$', self.css_content)
+            html = html.replace('$STATS$', stats)
+            html = html.replace('$DATA_ROW_COUNT$', str(data_row_count))
+            html = html.replace('$COLUMN_COUNT$', str(len(header_cells)))
+            html = html.replace('$HEADER$', header)
+            html = html.replace('$COLUMN_OPTIONS$', column_options)
+
+        tab.web_view.document_bridge.set_table(table)
+        self._set_html_with_base(tab, html)
+        tab.csv_table = table
+        if table is not None and tab.csv_table_view != CsvTableView():
+            self._apply_csv_view(tab)
+
+        if table is None:
+            worker = CsvIndexWorker(self.csv_index_cache, file_path)
+            tab.csv_worker = worker
+            worker.index_ready.connect(
+                lambda table, t=tab, w=worker: self._on_csv_indexed(t, w, table))
+            worker.index_failed.connect(
+                lambda error, t=tab, w=worker: self._on_csv_index_failed(t, w, error))
+            worker.finished.connect(lambda w=worker: self._release_csv_worker(w))
+            self._csv_workers.add(worker)
+            worker.start()
+
+    @staticmethod
+    def _csv_stats_text(table: CsvTable) -> str:
+        return f'{table.row_count:,} rows, {table.column_count} columns'
+
+    def _cancel_csv_worker(self, tab: FolderTab):
+        """Stop indexing or analyzing the CSV file of a tab, if running"""
+        if tab.csv_worker is not None:
+            tab.csv_worker.cancel()
+            tab.csv_worker = None
+
+    def _release_csv_worker(self, worker: QThread):
+        """Drop our reference to a worker once its thread has exited"""
+        worker.wait()
+        self._csv_workers.discard(worker)
+
+    def _on_csv_indexed(self, tab: FolderTab, worker: CsvIndexWorker, table: CsvTable):
+        """Serve the rows of a CSV table whose page is waiting for its index"""
+        if tab.csv_worker is not worker:
+            return  # Superseded by another file or a reload
+        tab.csv_worker = None
+        if tab.current_file != table.file_path or tab.current_view != 'document':
+            return
+        tab.web_view.document_bridge.set_table(table)
+        tab.csv_table = table
+        tab.update_table_stats(table.row_count, worker.file_size)
+        tab.run_page_js(f"setRowCount({max(table.row_count - 1, 0)}, "
+                        f"{json.dumps(self._csv_stats_text(table))});")
+        if tab.csv_table_view != CsvTableView():
+            self._apply_csv_view(tab)
+
+    def _on_csv_index_failed(self, tab: FolderTab, worker: CsvIndexWorker, error: str):
+        """Report a CSV file that could not be indexed"""
+        if tab.csv_worker is not worker:
+            return
+        tab.csv_worker = None
+        print(f"Error indexing CSV file: {error}")
+        tab.run_page_js(f"setRowCount(0, {json.dumps('Failed to index rows')});")
+
+    def _handle_csv_action(self, tab: FolderTab, url: str):
+        """Apply a sort, filter or column statistics link of a CSV table page"""
+        if tab.csv_table is None:
+            return  # Rows are still being indexed
+        parsed = urlparse(url)
+        params = parse_qs(parsed.query)
+        try:
+            column = int(params.get('column', ['-1'])[0])
+        except ValueError:
+            return
+        view = tab.csv_table_view
+        if parsed.netloc == 'csv-sort':
+            # Ascending first, then toggle the direction
+            view.descending = view.sort_column == column and not view.descending
+            view.sort_column = column
+        elif parsed.netloc == 'csv-filter':
+            view.filter_column = column
+            view.filter_text = params.get('text', [''])[0]
+        elif parsed.netloc == 'csv-stats':
+            view.stats_column = column
+            if tab.csv_table.columns is not None:
+                self._show_csv_column_stats(tab)
+                return
+        else:
+            return
+        self._apply_csv_view(tab)
 
-            html = f'''<!DOCTYPE html>
-<html><head>
-    <meta charset="UTF-8">
-    <style>{self.css_content}</style>
-    <style>
-        body {{ margin: 0; padding: 20px; background: var(--bg-color, #f8faff); }}
-        .csv-header {{
-            background: var(--h2-bg, linear-gradient(135deg, #1976d2 0%, #1565c0 100%));
-            color: white; padding: 12px 20px;
-            border-radius: 6px; font-weight: 600; margin-bottom: 16px;
-            display: flex; align-items: center; gap: 8px;
-        }}
-        .file-badge {{
-            background: rgba(255,255,255,0.2); padding: 2px 8px;
-            border-radius: 4px; font-size: 11px;
-        }}
-        .csv-stats {{
-            font-size: 12px; font-weight: normal; opacity: 0.9; margin-left: auto;
-        }}
-        table {{
-            width: 100%; border-collapse: collapse; font-size: 13px;
-            background: white; border-radius: 6px; overflow: hidden;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
-        th {{
-            background: var(--table-header-bg, #e3f2fd);
-            color: var(--heading-color, #0d47a1);
-            padding: 10px 12px; text-align: left; font-weight: 600;
-            border-bottom: 2px solid var(--table-border, #90caf9);
-        }}
-        td {{
-            padding: 8px 12px;
-            border-bottom: 1px solid var(--table-border, #e0e0e0);
-            max-width: 300px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;
-        }}
-        tr:hover td {{ background: var(--table-row-hover, #f5f5f5); }}
-    </style>
-</head><body>
-    <div class="csv-header">
-        <span class="file-badge">CSV</span>
-        <span>CSV Data</span>
-        <span class="csv-stats">{row_count} rows, {col_count} columns</span>
-    </div>
-    <table>
-        <thead><tr>{header}</tr></thead>
-        <tbody>{body}</tbody>
-    </table>
-</body></html>'''
+    def _apply_csv_view(self, tab: FolderTab):
+        """Show a CSV table in the sort and filter of the tab
+
+        A large table is sorted and filtered by a worker, building its
+        columns on first use; the page keeps its rows until the order is ready.
+        """
+        table = tab.csv_table
+        view = tab.csv_table_view
+        # Start of the last row: close enough to the file size
+        if table.offsets[-1] <= CSV_BACKGROUND_INDEX_SIZE:
+            if table.columns is None:
+                table.columns = CsvColumns.from_table(table)
+            self._show_csv_view(tab, table.columns.row_order(view))
+            return
+
+        if table.columns is None:
+            # A running worker reapplies the view once its columns are built
+            if not isinstance(tab.csv_worker, CsvViewWorker):
+                self._start_csv_view_worker(tab, table)
+            status = 'Analyzing columns…'
+        else:
+            self._start_csv_view_worker(tab, table)
+            status = 'Filtering…' if view.filter_text else 'Sorting…'
+        tab.run_page_js(f"setTableStatus({json.dumps(status)});")
+
+    def _show_csv_view(self, tab: FolderTab, row_order: Optional[array]):
+        """Serve the rows of a CSV table page in a new order"""
+        table = tab.csv_table
+        view = tab.csv_table_view
+        tab.web_view.document_bridge.set_row_order(row_order)
+        shown = table.row_count - 1 if row_order is None else len(row_order)
+        if view.filter_text:
+            stats = f'{shown:,} matching row{"s" if shown != 1 else ""}, {table.column_count} columns'
+        else:
+            stats = self._csv_stats_text(table)
+        tab.run_page_js(f"setTableView({shown}, {json.dumps(stats)}, {view.sort_column}, "
+                        f"{'true' if view.descending else 'false'}, {view.filter_column}, "
+                        f"{json.dumps(view.filter_text)});")
+        self._show_csv_column_stats(tab)
+
+    def _show_csv_column_stats(self, tab: FolderTab):
+        """Show (or hide) the statistics panel of the selected column"""
+        table = tab.csv_table
+        column = tab.csv_table_view.stats_column
+        summary = None
+        if table.columns is not None and 0 <= column < len(table.columns.columns):
+            summary = table.columns.summary(column)
+        tab.run_page_js(f"showColumnStats({json.dumps(summary)});")
+
+    def _start_csv_view_worker(self, tab: FolderTab, table: CsvTable):
+        """Sort and filter a large CSV table in the background"""
+        self._cancel_csv_worker(tab)
+        worker = CsvViewWorker(table, replace(tab.csv_table_view))
+        tab.csv_worker = worker
+        worker.view_ready.connect(
+            lambda columns, row_order, t=tab, w=worker: self._on_csv_view_ready(t, w, columns, row_order))
+        worker.view_failed.connect(
+            lambda error, t=tab, w=worker: self._on_csv_view_failed(t, w, error))
+        worker.finished.connect(lambda w=worker: self._release_csv_worker(w))
+        self._csv_workers.add(worker)
+        worker.start()
+
+    def _on_csv_view_ready(self, tab: FolderTab, worker: CsvViewWorker,
+                           columns: CsvColumns, row_order: Optional[array]):
+        """Show the rows of a CSV table in the order a worker computed"""
+        if tab.csv_worker is not worker:
+            return
+        tab.csv_worker = None
+        worker.table.columns = columns
+        if tab.csv_table is not worker.table:
+            return
+        view = tab.csv_table_view
+        if replace(worker.view, stats_column=view.stats_column) != view:
+            self._apply_csv_view(tab)  # Sorted or filtered again while columns were built
+        else:
+            self._show_csv_view(tab, row_order)
 
+    def _on_csv_view_failed(self, tab: FolderTab, worker: CsvViewWorker, error: str):
+        """Report a CSV table whose columns could not be built"""
+        if tab.csv_worker is not worker:
+            return
+        tab.csv_worker = None
+        print(f"Error analyzing CSV columns: {error}")
+        tab.run_page_js(f"setTableStatus({json.dumps('Failed to analyze columns')});")
+
+    def _render_xml_outline(self, tab: FolderTab, file_path: str):
+        """Render a large XML file as an outline of its elements
+
+        Only the root element is read here. A worker lists the children of
+        an element by its byte offset when the page expands it, starting with
+        the root, and the page asks for the source at an element's offset.
+        """
+        size = os.path.getsize(file_path)
+        outline = XmlOutline(file_path)
+        try:
+            root = outline.root()
+            stats = f'{size / (1024 * 1024):,.1f} MB'
+        except (OSError, ValueError, LookupError, xml.parsers.expat.ExpatError) as e:
+            print(f"Error reading XML outline: {e}")
+            root = None
+            stats = f'Cannot read elements: {e}'
+
+        html = self.xml_outline_template
+        html = html.replace('$TITLE$', self._escape_html(os.path.basename(file_path)).replace('$', '&#36;'))
+        html = html.replace('$STATS$', self._escape_html(stats).replace('$', '&#36;'))
+        html = html.replace('$CSS_CONTENT$', self.css_content)
+        html = html.replace('$HIGHLIGHT_CSS$', self.highlight_css)
+        html = html.replace('$HIGHLIGHT_JS_CONTENT$', self.highlight_js_content)
+        # Last: names and attributes may contain placeholders
+        html = html.replace('$ROOT$', json.dumps(asdict(root) if root else None).replace('</', '<\\/'))
         self._set_html_with_base(tab, html)
+        tab.xml_outline = outline
+        tab.update_size_stats(size)
+        if root is not None and root.has_children:
+            self._start_xml_children_worker(tab, root.offset, root.line, None)
+
+    def _handle_xml_action(self, tab: FolderTab, url: str):
+        """List children or show the source of an element of an XML outline page"""
+        if tab.xml_outline is None:
+            return
+        parsed = urlparse(url)
+        params = parse_qs(parsed.query)
+        try:
+            offset = int(params['offset'][0])
+            line = int(params.get('line', ['1'])[0])
+            resume = int(params['resume'][0]) if 'resume' in params else None
+        except (KeyError, ValueError):
+            return
+        if parsed.netloc == 'xml-children':
+            if resume is not None and not self._xml_resume_available(tab, resume):
+                return  # "Load more" clicked again: the listing already continued
+            if tab.xml_worker is not None:
+                tab.xml_requests.append((offset, line, resume))  # One listing at a time
+            else:
+                self._start_xml_children_worker(tab, offset, line, resume)
+        elif parsed.netloc == 'xml-source':
+            try:
+                text = tab.xml_outline.source(offset)
+            except OSError as e:
+                print(f"Error reading XML source: {e}")
+                return
+            tab.run_page_js(f"showXmlSource({line}, {json.dumps(text)});")
+
+    def _xml_resume_available(self, tab: FolderTab, resume: int) -> bool:
+        """Whether a resume id of a tab's outline is neither used nor requested yet"""
+        if not tab.xml_outline.can_resume(resume):
+            return False
+        if tab.xml_worker is not None and tab.xml_worker.resume == resume:
+            return False  # Not taken by the running worker yet
+        return all(request[2] != resume for request in tab.xml_requests)
+
+    def _start_xml_children_worker(self, tab: FolderTab, offset: int, line: int, resume: Optional[int]):
+        """List the children of an outline element in the background"""
+        worker = XmlChildrenWorker(tab.xml_outline, offset, line, resume)
+        tab.xml_worker = worker
+        worker.children_found.connect(
+            lambda nodes, t=tab, w=worker: self._on_xml_children_found(t, w, nodes))
+        worker.children_ready.connect(
+            lambda nodes, resume, t=tab, w=worker: self._on_xml_children_ready(t, w, nodes, resume))
+        worker.children_failed.connect(
+            lambda error, t=tab, w=worker: self._on_xml_children_failed(t, w, error))
+        worker.finished.connect(lambda w=worker: self._release_xml_worker(w))
+        self._xml_workers.add(worker)
+        worker.start()
+
+    def _cancel_xml_worker(self, tab: FolderTab):
+        """Stop listing XML elements for a tab, dropping its waiting requests"""
+        tab.xml_requests = []
+        if tab.xml_worker is not None:
+            tab.xml_worker.cancel()
+            tab.xml_worker = None
+
+    def _release_xml_worker(self, worker: QThread):
+        """Drop our reference to a worker once its thread has exited"""
+        worker.wait()
+        self._xml_workers.discard(worker)
+
+    def _finish_xml_request(self, tab: FolderTab, worker: XmlChildrenWorker) -> bool:
+        """Start the next waiting listing; False if the worker's page is gone"""
+        tab.xml_worker = None
+        if tab.xml_outline is not worker.outline:
+            return False
+        if tab.xml_requests:
+            self._start_xml_children_worker(tab, *tab.xml_requests.pop(0))
+        return True
+
+    def _on_xml_children_found(self, tab: FolderTab, worker: XmlChildrenWorker, nodes: List[XmlNode]):
+        """Show children listed so far while the worker reads on"""
+        if tab.xml_worker is not worker or tab.xml_outline is not worker.outline:
+            return
+        tab.run_page_js(f"addXmlChildren({worker.offset}, {json.dumps([asdict(n) for n in nodes])}, null, false);")
+
+    def _on_xml_children_ready(self, tab: FolderTab, worker: XmlChildrenWorker,
+                               nodes: List[XmlNode], resume: Optional[int]):
+        """Add the last listed children to the outline page"""
+        if tab.xml_worker is not worker or not self._finish_xml_request(tab, worker):
+            return
+        tab.run_page_js(f"addXmlChildren({worker.offset}, {json.dumps([asdict(n) for n in nodes])}, "
+                        f"{json.dumps(resume)}, true);")
+
+    def _on_xml_children_failed(self, tab: FolderTab, worker: XmlChildrenWorker, error: str):
+        """Report an element whose children could not be listed"""
+        if tab.xml_worker is not worker or not self._finish_xml_request(tab, worker):
+            return
+        print(f"Error listing XML elements: {error}")
+        tab.run_page_js(f"xmlChildrenFailed({worker.offset}, {json.dumps('Cannot read elements: ' + error)});")
 
     def _render_cdxml(self, tab: FolderTab, content: str):
         """Render CDXML chemical structure as SVG"""
@@ -2914,6 +6073,8 @@ class MarkdownViewer(QMainWindow):
     def _refresh_current_tab(self):
         """Refresh current file in current tab, preserving scroll position"""
         tab = self._get_current_tab()
+        if tab and tab.current_folder:
+            self.search_engine.invalidate(tab.current_folder)
         if tab and tab.current_file and os.path.exists(tab.current_file):
             tab.navigation_history.clear()
             self._reload_with_scroll(tab)
@@ -2935,23 +6096,31 @@ class MarkdownViewer(QMainWindow):
                 pass
             self._pending_load_finished_handler = None
 
-        self._load_file(tab, tab.current_file)
+        tab._restore_scroll_y = scroll_y if scroll_y is not None and scroll_y > 0 else 0
+        tab._update_in_place = True
+        try:
+            self._load_file(tab, tab.current_file)
+        finally:
+            tab._update_in_place = False
+
+        # Markdown and code renders apply the scroll position; other pages restore it after loading
+        if not tab._restore_scroll_y:
+            return
+        tab._restore_scroll_y = 0
 
-        # Restore scroll position after page finishes loading
-        if scroll_y is not None and scroll_y > 0:
-            def on_load_finished(ok):
-                self._pending_load_finished_handler = None
-                try:
-                    tab.web_view.loadFinished.disconnect(on_load_finished)
-                except TypeError:
-                    pass
-                if ok:
-                    # Delay for DOM rendering to complete before scrolling
-                    QTimer.singleShot(100, lambda: tab.web_view.page().runJavaScript(
-                        f"window.scrollTo(0, {int(scroll_y)})"
-                    ))
-            self._pending_load_finished_handler = on_load_finished
-            tab.web_view.loadFinished.connect(on_load_finished)
+        def on_load_finished(ok):
+            self._pending_load_finished_handler = None
+            try:
+                tab.web_view.loadFinished.disconnect(on_load_finished)
+            except TypeError:
+                pass
+            if ok:
+                # Delay for DOM rendering to complete before scrolling
+                QTimer.singleShot(100, lambda: tab.web_view.page().runJavaScript(
+                    f"window.scrollTo(0, {int(scroll_y)})"
+                ))
+        self._pending_load_finished_handler = on_load_finished
+        tab.web_view.loadFinished.connect(on_load_finished)
 
     # --- File Watcher (auto-reload) ---
 
@@ -2972,6 +6141,7 @@ class MarkdownViewer(QMainWindow):
 
     def _on_file_changed(self, path: str):
         """Handle file change notification (debounced)"""
+        self.search_engine.invalidate(path)
         self._pending_reload_paths.add(path)
         self._reload_timer.start()
         # Re-add path to watcher (some OS remove it after change)
@@ -2985,6 +6155,8 @@ class MarkdownViewer(QMainWindow):
         for path in paths:
             for i in range(self.tab_widget.count()):
                 tab = self.tab_widget.widget(i)
+                if tab.restore_pending:
+                    continue  # Reads the file when first shown
                 if tab.current_file == path and os.path.exists(path):
                     self._reload_with_scroll(tab)
 
@@ -3043,11 +6215,26 @@ class MarkdownViewer(QMainWindow):
                 self._handle_search_result_click(tab, url)
                 return
 
+            # Handle CSV table sort, filter and column statistics
+            if url.startswith('app://csv-'):
+                self._handle_csv_action(tab, url)
+                return
+
+            # Handle XML outline expansion and jump to source
+            if url.startswith('app://xml-'):
+                self._handle_xml_action(tab, url)
+                return
+
             # Handle open file (from recent/bookmarks)
             if url.startswith('app://open-file?'):
                 self._handle_open_file_click(tab, url)
                 return
 
+            # Handle next page of search results
+            if url == 'app://search-more':
+                self._show_more_results(tab)
+                return
+
             # Handle export results
             if url == 'app://export-results':
                 self._export_search_results(tab)
@@ -3183,6 +6370,7 @@ class MarkdownViewer(QMainWindow):
                 tab.current_search_query = query
                 tab.current_search_results = results
                 tab.current_search_scope = scope
+                tab.current_search_ranking = previous_state[4] if len(previous_state) > 4 else None
                 self._render_search_results(tab, results, query, scope)
 
         else:
@@ -3218,7 +6406,8 @@ class MarkdownViewer(QMainWindow):
         # Save current search results to history
         if tab.current_search_results:
             tab.navigation_history.append(('search', tab.current_search_query,
-                                           tab.current_search_results, tab.current_search_scope))
+                                           tab.current_search_results, tab.current_search_scope,
+                                           tab.current_search_ranking))
 
         # Open file with highlighting
         tab.current_file = file_path
@@ -3301,7 +6490,8 @@ class MarkdownViewer(QMainWindow):
             tab.navigation_history.append(('file', tab.current_file))
         elif tab.current_search_results:
             tab.navigation_history.append(('search', tab.current_search_query,
-                                           tab.current_search_results, tab.current_search_scope))
+                                           tab.current_search_results, tab.current_search_scope,
+                                           tab.current_search_ranking))
 
         # Generate list items HTML
         list_items_html = self._generate_list_items_html(recent_files, 'recent')
@@ -3320,7 +6510,7 @@ class MarkdownViewer(QMainWindow):
             base_url = QUrl.fromLocalFile(tab.current_folder + '/')
         else:
             base_url = QUrl()
-        tab.web_view.setHtml(html, base_url)
+        tab.set_html(html, base_url, 'list')
         self._update_window_title()
 
     def _show_bookmarks(self, tab: FolderTab):
@@ -3335,7 +6525,8 @@ class MarkdownViewer(QMainWindow):
             tab.navigation_history.append(('file', tab.current_file))
         elif tab.current_search_results:
             tab.navigation_history.append(('search', tab.current_search_query,
-                                           tab.current_search_results, tab.current_search_scope))
+                                           tab.current_search_results, tab.current_search_scope,
+                                           tab.current_search_ranking))
 
         # Generate list items HTML
         list_items_html = self._generate_list_items_html(bookmarks, 'bookmarks')
@@ -3354,7 +6545,7 @@ class MarkdownViewer(QMainWindow):
             base_url = QUrl.fromLocalFile(tab.current_folder + '/')
         else:
             base_url = QUrl()
-        tab.web_view.setHtml(html, base_url)
+        tab.set_html(html, base_url, 'list')
         self._update_window_title()
 
     def _show_link_context_menu(self, tab: FolderTab, pos):
@@ -3468,6 +6659,12 @@ class MarkdownViewer(QMainWindow):
         """Save session before closing"""
         self.session_manager.save_session(self)
 
+        # Stop running searches and indexing so no thread outlives the window
+        for worker in list(self._search_workers) + list(self._csv_workers) + list(self._xml_workers):
+            worker.cancel()
+            worker.wait()
+        self.search_engine.shutdown()
+
         # Stop all WebViews before closing to prevent JS errors
         for i in range(self.tab_widget.count()):
             tab = self.tab_widget.widget(i)
@@ -3505,10 +6702,9 @@ class MarkdownViewer(QMainWindow):
             if window_state.get('maximized', False):
                 self.showMaximized()
 
-            # Restore tabs
+            # Restore tabs as placeholders; only the active one is loaded
             tabs_data = session_data.get('tabs', [])
             restored_any = False
-            pending_file_loads = []
 
             for tab_data in tabs_data:
                 folder = tab_data.get('folder_path')
@@ -3520,7 +6716,7 @@ class MarkdownViewer(QMainWindow):
                     continue
 
                 if folder:
-                    tab = self._add_new_tab(folder)
+                    tab = self._add_new_tab(folder, restored=True)
                     tab.set_filter_index(filter_index)
                     restored_any = True
 
@@ -3531,28 +6727,14 @@ class MarkdownViewer(QMainWindow):
                         if os.path.exists(f.get('file_path', ''))
                     ]
 
-                    # Queue file for delayed loading (QFileSystemModel needs time)
                     if selected_file and os.path.exists(selected_file):
-                        pending_file_loads.append((tab, selected_file))
+                        tab.current_file = selected_file
 
             # If no tabs were restored, show welcome tab
             if not restored_any:
                 self._add_welcome_tab()
                 return
 
-            # Delay file selection and loading to allow QFileSystemModel to populate
-            def load_pending_files():
-                for tab, file_path in pending_file_loads:
-                    tab.current_file = file_path
-                    self._update_scope_toggle_state(tab)
-                    file_index = tab.file_model.index(file_path)
-                    if file_index.isValid():
-                        tab.tree_view.setCurrentIndex(file_index)
-                        tab.tree_view.scrollTo(file_index)
-                    self._load_file(tab, file_path)
-
-            QTimer.singleShot(200, load_pending_files)
-
             # Restore active tab
             active_index = session_data.get('active_tab_index', 0)
             if 0 <= active_index < self.tab_widget.count():
@@ -3564,6 +6746,9 @@ class MarkdownViewer(QMainWindow):
 
 
 def main():
+    # Frozen builds re-launch the executable for search worker processes
+    multiprocessing.freeze_support()
+
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
 